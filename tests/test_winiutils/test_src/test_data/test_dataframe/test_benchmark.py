@@ -0,0 +1,357 @@
+"""Tests for winiutils.src.data.dataframe.benchmark module."""
+
+import time
+from pathlib import Path
+
+import polars as pl
+import pytest
+from pyrig.src.testing.assertions import assert_with_msg
+
+from winiutils.src.data.dataframe.benchmark import (
+    FULL_CLEAN_STAGE,
+    RAW_PREFIX,
+    BenchmarkCleaningDF,
+    RssSampler,
+    benchmark_clean,
+    benchmark_round_col,
+    generate_benchmark_data,
+    get_current_rss,
+    get_uniform_expr,
+    get_winiutils_version,
+    round_col_loop,
+    run_benchmark_suite,
+    save_benchmark_results,
+)
+from winiutils.src.data.dataframe.cleaning import CleaningOptions
+
+
+class TestBenchmarkCleaningDF:
+    """Test class for BenchmarkCleaningDF."""
+
+    def test_with_float_cols(self) -> None:
+        """Test method for with_float_cols."""
+        cleaning_df_cls = BenchmarkCleaningDF.with_float_cols(3)
+        assert_with_msg(
+            issubclass(cleaning_df_cls, BenchmarkCleaningDF),
+            "Expected a subclass of BenchmarkCleaningDF",
+        )
+        assert_with_msg(
+            len(cleaning_df_cls.cleaning_config.float_cols) == 3,  # noqa: PLR2004
+            "Expected the config to have 3 float cols",
+        )
+
+    def test_get_float_col_names(self) -> None:
+        """Test method for get_float_col_names."""
+        names = BenchmarkCleaningDF.with_float_cols(2).get_float_col_names()
+        assert_with_msg(
+            names == ("float_col_0", "float_col_1"),
+            f"Expected two float cols, got {names}",
+        )
+
+    def test_get_rename_map(self) -> None:
+        """Test method for get_rename_map."""
+        rename_map = BenchmarkCleaningDF.get_rename_map()
+        assert_with_msg(
+            all(raw == f"{RAW_PREFIX}{col}" for col, raw in rename_map.items()),
+            f"Expected raw names with the prefix, got {rename_map}",
+        )
+
+    def test_get_col_dtype_map(self) -> None:
+        """Test method for get_col_dtype_map."""
+        dtype_map = BenchmarkCleaningDF.get_col_dtype_map()
+        assert_with_msg(
+            dtype_map[BenchmarkCleaningDF.STR_COL] == pl.Utf8,
+            f"Expected a string col, got {dtype_map}",
+        )
+
+    def test_get_drop_null_subsets(self) -> None:
+        """Test method for get_drop_null_subsets."""
+        assert_with_msg(
+            BenchmarkCleaningDF.get_drop_null_subsets()
+            == ((BenchmarkCleaningDF.STR_COL, BenchmarkCleaningDF.INT_COL),),
+            "Expected the key cols",
+        )
+
+    def test_get_fill_null_map(self) -> None:
+        """Test method for get_fill_null_map."""
+        fill_null_map = BenchmarkCleaningDF.get_fill_null_map()
+        assert_with_msg(
+            set(fill_null_map) == set(BenchmarkCleaningDF.get_col_names()),
+            f"Expected a fill value for every col, got {fill_null_map}",
+        )
+
+    def test_get_sort_cols(self) -> None:
+        """Test method for get_sort_cols."""
+        assert_with_msg(
+            BenchmarkCleaningDF.get_sort_cols()[0]
+            == (BenchmarkCleaningDF.INT_COL, False),
+            "Expected to sort by the int col first",
+        )
+
+    def test_get_unique_subsets(self) -> None:
+        """Test method for get_unique_subsets."""
+        assert_with_msg(
+            BenchmarkCleaningDF.get_unique_subsets()
+            == ((BenchmarkCleaningDF.STR_COL, BenchmarkCleaningDF.INT_COL),),
+            "Expected the key cols",
+        )
+
+    def test_get_no_null_cols(self) -> None:
+        """Test method for get_no_null_cols."""
+        assert_with_msg(
+            BenchmarkCleaningDF.get_no_null_cols()
+            == (BenchmarkCleaningDF.STR_COL, BenchmarkCleaningDF.INT_COL),
+            "Expected the key cols",
+        )
+
+    def test_get_col_converter_map(self) -> None:
+        """Test method for get_col_converter_map."""
+        converter_map = BenchmarkCleaningDF.get_col_converter_map()
+        assert_with_msg(
+            set(converter_map) == set(BenchmarkCleaningDF.get_col_names()),
+            f"Expected a converter for every col, got {converter_map}",
+        )
+
+    def test_get_add_on_duplicate_cols(self) -> None:
+        """Test method for get_add_on_duplicate_cols."""
+        assert_with_msg(
+            BenchmarkCleaningDF.get_add_on_duplicate_cols() == ("float_col_0",),
+            "Expected the first float col",
+        )
+        assert_with_msg(
+            BenchmarkCleaningDF.with_float_cols(0).get_add_on_duplicate_cols() == (),
+            "Expected no add on cols without float cols",
+        )
+
+    def test_get_col_precision_map(self) -> None:
+        """Test method for get_col_precision_map."""
+        assert_with_msg(
+            BenchmarkCleaningDF.get_col_precision_map() == {"float_col_0": 2},
+            "Expected a precision of 2 for the float col",
+        )
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        c_df = BenchmarkCleaningDF(generate_benchmark_data(100))
+        assert_with_msg(
+            c_df.peak_rss_delta_by_stage == {},
+            "Expected no memory deltas without profiling",
+        )
+
+    def test_profile_stage(self) -> None:
+        """Test method for profile_stage."""
+        c_df = BenchmarkCleaningDF(
+            generate_benchmark_data(100), options=CleaningOptions(profile=True)
+        )
+        assert c_df.profile is not None
+        stages = c_df.profile.to_df()["stage"].to_list()
+        assert_with_msg(
+            list(c_df.peak_rss_delta_by_stage) == stages,
+            "Expected a memory delta for every stage, "
+            f"got {c_df.peak_rss_delta_by_stage}",
+        )
+
+
+class TestRssSampler:
+    """Test class for RssSampler."""
+
+    n_bytes = 64 * 1024**2
+
+    def test___init__(self) -> None:
+        """Test method for __init__."""
+        sampler = RssSampler(interval=0.5)
+        assert_with_msg(
+            sampler.interval == 0.5  # noqa: PLR2004
+            and sampler.get_peak_delta() is None
+            and not sampler.thread.is_alive(),
+            "Expected a sampler that is not started",
+        )
+
+    def test___enter__(self) -> None:
+        """Test method for __enter__."""
+        with RssSampler() as sampler:
+            assert_with_msg(
+                sampler.thread.is_alive() == (get_current_rss() is not None),
+                "Expected the sampling thread to run where the RSS is available",
+            )
+
+    def test___exit__(self) -> None:
+        """Test method for __exit__."""
+        with RssSampler() as sampler:
+            data = b"x" * self.n_bytes
+        delta = sampler.get_peak_delta()
+        assert_with_msg(
+            not sampler.thread.is_alive(), "Expected the thread to be stopped"
+        )
+        assert_with_msg(
+            delta is None or delta >= self.n_bytes // 2,
+            f"Expected the memory still held at exit, got {delta}",
+        )
+        del data
+
+    def test_sample_until_stopped(self) -> None:
+        """Test method for sample_until_stopped."""
+        with RssSampler() as sampler:
+            data = b"x" * self.n_bytes
+            time.sleep(0.1)
+            del data
+            time.sleep(0.1)
+        delta = sampler.get_peak_delta()
+        assert_with_msg(
+            delta is None or delta >= self.n_bytes // 2,
+            f"Expected the freed memory to be part of the peak, got {delta}",
+        )
+
+    def test_sample(self) -> None:
+        """Test method for sample."""
+        sampler = RssSampler()
+        sampler.sample()
+        assert_with_msg(sampler.peak_rss is None, "Expected no peak before start")
+        sampler.start_rss = sampler.peak_rss = 0
+        sampler.sample()
+        assert_with_msg(
+            sampler.peak_rss > 0 or get_current_rss() is None,
+            f"Expected the current RSS as peak, got {sampler.peak_rss}",
+        )
+
+    def test_get_peak_delta(self) -> None:
+        """Test method for get_peak_delta."""
+        sampler = RssSampler()
+        sampler.start_rss, sampler.peak_rss = 100, 250
+        assert_with_msg(
+            sampler.get_peak_delta() == 150,  # noqa: PLR2004
+            f"Expected the peak minus the start, got {sampler.get_peak_delta()}",
+        )
+
+
+def test_get_current_rss() -> None:
+    """Test func for get_current_rss."""
+    rss = get_current_rss()
+    assert_with_msg(rss is None or rss > 0, f"Expected a positive RSS, got {rss}")
+
+
+def test_get_uniform_expr() -> None:
+    """Test func for get_uniform_expr."""
+    frame = pl.DataFrame({"i": range(1000)})
+    values = frame.select(get_uniform_expr(0))
+    col = values.to_series()
+    assert_with_msg(
+        ((col >= 0) & (col < 1)).all(), f"Expected values in [0, 1), got {col}"
+    )
+    again = frame.select(get_uniform_expr(0))
+    assert_with_msg(again.equals(values), "Expected reproducible values")
+
+
+def test_generate_benchmark_data() -> None:
+    """Test func for generate_benchmark_data."""
+    n_rows = 2000
+    data = generate_benchmark_data(
+        n_rows, null_rate=0.1, duplicate_rate=0.5, whitespace=True, n_float_cols=3
+    )
+    assert_with_msg(data.height == n_rows, f"Expected {n_rows} rows, got {data}")
+    str_col = f"{RAW_PREFIX}{BenchmarkCleaningDF.STR_COL}"
+    assert_with_msg(
+        str_col in data.columns and f"{RAW_PREFIX}float_col_2" in data.columns,
+        f"Expected the raw columns, got {data.columns}",
+    )
+    null_share = data[str_col].null_count() / n_rows
+    assert_with_msg(
+        0.05 < null_share < 0.15,  # noqa: PLR2004
+        f"Expected about 10% nulls, got {null_share}",
+    )
+    keys = data[f"{RAW_PREFIX}{BenchmarkCleaningDF.INT_COL}"].drop_nulls()
+    assert_with_msg(
+        keys.n_unique() < keys.len() * 0.75,
+        "Expected duplicated keys",
+    )
+    assert_with_msg(
+        data[str_col].drop_nulls().str.starts_with(" ").all(),
+        "Expected whitespace around the strings",
+    )
+
+
+def test_benchmark_clean() -> None:
+    """Test func for benchmark_clean."""
+    n_rows = 1000
+    results = benchmark_clean(
+        BenchmarkCleaningDF, generate_benchmark_data(n_rows, duplicate_rate=0.1)
+    )
+    assert_with_msg(
+        results["stage"][-1] == FULL_CLEAN_STAGE,
+        f"Expected the full clean as last row, got {results}",
+    )
+    assert_with_msg(
+        results.columns
+        == [
+            "n_rows",
+            "stage",
+            "seconds",
+            "rows_per_second",
+            "estimated_size",
+            "peak_rss_delta",
+        ],
+        f"Expected the result columns, got {results.columns}",
+    )
+    assert_with_msg(
+        (results["n_rows"] == n_rows).all(), "Expected the row count on every row"
+    )
+
+
+def test_round_col_loop() -> None:
+    """Test func for round_col_loop."""
+    col = pl.Series("x", [0.004, 0.004, 0.004])
+    rounded = round_col_loop(col, 2)
+    assert_with_msg(
+        rounded.to_list() == [0.0, 0.01, 0.0],
+        f"Expected the error to be carried, got {rounded.to_list()}",
+    )
+
+
+def test_benchmark_round_col() -> None:
+    """Test func for benchmark_round_col."""
+    results = benchmark_round_col(1000)
+    assert_with_msg(
+        results["method"].to_list() == ["loop", "round_col"],
+        f"Expected a row per method, got {results}",
+    )
+    assert_with_msg(
+        results.columns == ["n_rows", "method", "seconds", "rows_per_second"],
+        f"Expected the result columns, got {results.columns}",
+    )
+
+
+def test_run_benchmark_suite(tmp_path: Path) -> None:
+    """Test func for run_benchmark_suite."""
+    path = tmp_path / "results.csv"
+    results = run_benchmark_suite((100, 200), path=path)
+    assert_with_msg(
+        set(results["n_rows"]) == {100, 200},
+        f"Expected results for both row counts, got {results}",
+    )
+    assert_with_msg(path.exists(), "Expected the results to be saved")
+
+
+def test_get_winiutils_version() -> None:
+    """Test func for get_winiutils_version."""
+    assert_with_msg(
+        isinstance(get_winiutils_version(), str), "Expected a version string"
+    )
+
+
+def test_save_benchmark_results(tmp_path: Path) -> None:
+    """Test func for save_benchmark_results."""
+    results = benchmark_clean(BenchmarkCleaningDF, generate_benchmark_data(100))
+    for suffix in (".csv", ".parquet"):
+        path = tmp_path / f"results{suffix}"
+        save_benchmark_results(results, path)
+        saved = save_benchmark_results(results, path)
+        assert_with_msg(
+            saved.height == 2 * results.height,
+            f"Expected the second run to be appended, got {saved}",
+        )
+        assert_with_msg(
+            "winiutils_version" in saved.columns,
+            "Expected the version to be saved",
+        )
+    with pytest.raises(ValueError, match="Unsupported file suffix"):
+        save_benchmark_results(results, tmp_path / "results.json")
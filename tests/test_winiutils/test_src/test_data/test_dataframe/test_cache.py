@@ -0,0 +1,341 @@
+"""Tests for winiutils.src.data.dataframe.cache module."""
+
+import inspect
+import os
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+from pyrig.src.testing.assertions import assert_with_msg
+from pytest_mock import MockerFixture
+
+from winiutils.src.data.dataframe.benchmark import (
+    BenchmarkCleaningDF,
+    generate_benchmark_data,
+)
+from winiutils.src.data.dataframe.cache import (
+    CACHE_SUFFIX,
+    CleaningCache,
+    get_callable_fingerprint,
+    get_code_fingerprint,
+    get_config_fingerprint,
+    get_data_fingerprint,
+    get_file_fingerprint,
+    get_object_fingerprint,
+)
+from winiutils.src.data.dataframe.cleaning import CleaningOptions
+
+
+class MyScaledCleaningDF(BenchmarkCleaningDF):
+    """BenchmarkCleaningDF that scales the int col with a converter method."""
+
+    @classmethod
+    def get_col_converter_map(cls) -> dict[str, Any]:
+        """Scale the int col with scale_col."""
+        return {**super().get_col_converter_map(), cls.INT_COL: cls.scale_col}
+
+    @classmethod
+    def scale_col(cls, col: pl.Series) -> pl.Series:
+        """Double the values of a column."""
+        return col * 2
+
+
+class TestCleaningCache:
+    """Test class for CleaningCache."""
+
+    def test___init__(self, tmp_path: Path) -> None:
+        """Test method for __init__."""
+        cache_dir = tmp_path / "nested" / "cache"
+        cache = CleaningCache(cache_dir, max_bytes=100)
+        assert_with_msg(cache_dir.is_dir(), "Expected the cache dir to be created")
+        assert_with_msg(cache.max_bytes == 100, "Expected the size limit")  # noqa: PLR2004
+
+    def test_clean(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Test method for clean."""
+        cache = CleaningCache(tmp_path)
+        data = generate_benchmark_data(100)
+        spy = mocker.spy(BenchmarkCleaningDF, BenchmarkCleaningDF.clean.__name__)
+        first = cache.clean(BenchmarkCleaningDF, data)
+        second = cache.clean(BenchmarkCleaningDF, data)
+        assert_with_msg(spy.call_count == 1, "Expected the second clean to be a hit")
+        assert_with_msg(
+            isinstance(second, BenchmarkCleaningDF) and second.df.equals(first.df),
+            f"Expected the cached result, got {second.df}",
+        )
+        for _ in range(2):
+            compacted = cache.clean(
+                BenchmarkCleaningDF, data, options=CleaningOptions(compact=True)
+            )
+        assert_with_msg(
+            spy.call_count == 2 and compacted.compacted,  # noqa: PLR2004
+            "Expected other clean kwargs to be a miss and compact data to be a hit",
+        )
+
+        # editing the body of a converter between runs is a miss
+        doubled = cache.clean(MyScaledCleaningDF, data)
+        scale_col = inspect.unwrap(MyScaledCleaningDF.__dict__["scale_col"].__func__)
+        code = scale_col.__code__
+        scale_col.__code__ = (lambda _cls, col: col * 3).__code__
+        try:
+            tripled = cache.clean(MyScaledCleaningDF, data)
+        finally:
+            scale_col.__code__ = code
+        assert_with_msg(
+            spy.call_count == 4,  # noqa: PLR2004
+            "Expected an edited converter to be a miss",
+        )
+        assert_with_msg(
+            tripled.df[MyScaledCleaningDF.INT_COL].sum()
+            == doubled.df[MyScaledCleaningDF.INT_COL].sum() // 2 * 3,
+            "Expected the result of the edited converter",
+        )
+
+    def test_clean_file(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Test method for clean_file."""
+        cache = CleaningCache(tmp_path / "cache")
+        path = tmp_path / "raw.parquet"
+        generate_benchmark_data(100).write_parquet(path)
+        spy = mocker.spy(BenchmarkCleaningDF, BenchmarkCleaningDF.clean.__name__)
+        first = cache.clean_file(BenchmarkCleaningDF, path)
+        second = cache.clean_file(BenchmarkCleaningDF, path)
+        assert_with_msg(spy.call_count == 1, "Expected the second clean to be a hit")
+        assert_with_msg(
+            second.df.equals(first.df), f"Expected the cached result, got {second.df}"
+        )
+
+    def test_get_or_clean(self, tmp_path: Path) -> None:
+        """Test method for get_or_clean."""
+        cache = CleaningCache(tmp_path)
+        data = generate_benchmark_data(50)
+        calls: list[BenchmarkCleaningDF] = []
+
+        def clean_func() -> BenchmarkCleaningDF:
+            calls.append(BenchmarkCleaningDF(data))
+            return calls[-1]
+
+        for _ in range(2):
+            cleaned = cache.get_or_clean(BenchmarkCleaningDF, "fingerprint", clean_func)
+        assert_with_msg(len(calls) == 1, f"Expected one clean, got {len(calls)}")
+
+        # a hit resumes the Kahan rounding like the miss did
+        for c_df in (calls[0], cleaned):
+            for seed in range(1, 4):
+                c_df.append(generate_benchmark_data(20, seed=seed))
+        assert_with_msg(
+            cleaned.round_carry == calls[0].round_carry
+            and cleaned.df.equals(calls[0].df),
+            f"Expected appends to round alike, got {cleaned.round_carry}",
+        )
+
+    def test_get_key(self) -> None:
+        """Test method for get_key."""
+        key = CleaningCache.get_key(BenchmarkCleaningDF, "data")
+        assert_with_msg(
+            key
+            == CleaningCache.get_key(BenchmarkCleaningDF, "data", CleaningOptions()),
+            "Expected no kwargs and empty kwargs to give the same key",
+        )
+        other_keys = {
+            CleaningCache.get_key(BenchmarkCleaningDF, "other"),
+            CleaningCache.get_key(BenchmarkCleaningDF.with_float_cols(2), "data"),
+            CleaningCache.get_key(
+                BenchmarkCleaningDF, "data", CleaningOptions(compact=True)
+            ),
+        }
+        assert_with_msg(
+            key not in other_keys and len(other_keys) == 3,  # noqa: PLR2004
+            "Expected the data, the config and the kwargs to change the key",
+        )
+
+    def test_get_path(self, tmp_path: Path) -> None:
+        """Test method for get_path."""
+        path = CleaningCache(tmp_path).get_path("key")
+        assert_with_msg(
+            path == tmp_path / f"key{CACHE_SUFFIX}", f"Expected an ipc path, got {path}"
+        )
+
+    def test_load(self, tmp_path: Path) -> None:
+        """Test method for load."""
+        cache = CleaningCache(tmp_path)
+        assert_with_msg(
+            cache.load(BenchmarkCleaningDF, "missing") is None, "Expected a cache miss"
+        )
+        cleaned = BenchmarkCleaningDF(generate_benchmark_data(50))
+        cache.save("key", cleaned)
+        loaded = cache.load(BenchmarkCleaningDF, "key")
+        assert loaded is not None
+        assert_with_msg(
+            loaded.df.equals(cleaned.df), f"Expected {cleaned.df}, got {loaded.df}"
+        )
+
+    def test_save(self, tmp_path: Path) -> None:
+        """Test method for save."""
+        cache = CleaningCache(tmp_path)
+        cache.save("key", BenchmarkCleaningDF(generate_benchmark_data(50)))
+        path = cache.get_path("key")
+        names = {path.name, BenchmarkCleaningDF.get_round_carry_path(path).name}
+        assert_with_msg(
+            {p.name for p in tmp_path.iterdir()} == names,
+            "Expected only the entry with its round_carry and no temporary file",
+        )
+
+    def test_evict(self, tmp_path: Path) -> None:
+        """Test method for evict."""
+        cleaned = BenchmarkCleaningDF(generate_benchmark_data(1000))
+        cache = CleaningCache(tmp_path)
+        cache.save("old", cleaned)
+        cache.save("new", cleaned)
+        os.utime(cache.get_path("old"), (0, 0))
+        os.utime(cache.get_path("new"), (1, 1))
+        entry_size = cache.get_path("old").stat().st_size
+        # loading marks the entry as recently used
+        cache.load(BenchmarkCleaningDF, "old")
+        cache.max_bytes = entry_size
+        cache.evict()
+        assert_with_msg(
+            cache.get_path("old").exists() and not cache.get_path("new").exists(),
+            "Expected the least recently used entry to be evicted",
+        )
+        assert_with_msg(
+            not BenchmarkCleaningDF.get_round_carry_path(
+                cache.get_path("new")
+            ).exists(),
+            "Expected the round_carry of the evicted entry to be deleted",
+        )
+
+
+def test_get_data_fingerprint() -> None:
+    """Test func for get_data_fingerprint."""
+    df = pl.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    fingerprint = get_data_fingerprint(df)
+    assert_with_msg(
+        fingerprint == get_data_fingerprint(df.clone()),
+        "Expected equal data to have the same fingerprint",
+    )
+    others = {
+        get_data_fingerprint(df.reverse()),
+        get_data_fingerprint(df.with_columns(pl.col("a").cast(pl.Int32))),
+        get_data_fingerprint(pl.DataFrame()),
+    }
+    assert_with_msg(
+        fingerprint not in others and len(others) == 3,  # noqa: PLR2004
+        "Expected the order, the dtypes and the content to change the fingerprint",
+    )
+
+
+def test_get_file_fingerprint(tmp_path: Path) -> None:
+    """Test func for get_file_fingerprint."""
+    path = tmp_path / "raw.csv"
+    path.write_text("a\n1\n")
+    fingerprint = get_file_fingerprint(path)
+    copy = tmp_path / "copy.csv"
+    copy.write_text("a\n1\n")
+    assert_with_msg(
+        fingerprint == get_file_fingerprint(copy),
+        "Expected the same bytes to have the same fingerprint",
+    )
+    path.write_text("a\n2\n")
+    assert_with_msg(
+        fingerprint != get_file_fingerprint(path),
+        "Expected changed bytes to change the fingerprint",
+    )
+
+
+def test_get_config_fingerprint(mocker: MockerFixture) -> None:
+    """Test func for get_config_fingerprint."""
+    fingerprint = get_config_fingerprint(BenchmarkCleaningDF)
+    assert_with_msg(
+        fingerprint == get_config_fingerprint(BenchmarkCleaningDF),
+        "Expected a stable fingerprint",
+    )
+    assert_with_msg(
+        fingerprint != get_config_fingerprint(BenchmarkCleaningDF.with_float_cols(3)),
+        "Expected another config to change the fingerprint",
+    )
+    mocker.patch(
+        "winiutils.src.data.dataframe.cache.get_winiutils_version",
+        return_value="0.0.0",
+    )
+    assert_with_msg(
+        fingerprint != get_config_fingerprint(BenchmarkCleaningDF),
+        "Expected another winiutils version to change the fingerprint",
+    )
+
+
+def test_get_object_fingerprint() -> None:
+    """Test func for get_object_fingerprint."""
+    converters = {"a": BenchmarkCleaningDF.lower_expr, "b": pl.col("b") + 1}
+    fingerprint = get_object_fingerprint(converters)
+    assert_with_msg(
+        "0x" not in fingerprint and "lower_expr" in fingerprint,
+        f"Expected no memory addresses, got {fingerprint}",
+    )
+    assert_with_msg(
+        get_object_fingerprint(lambda x: x + 1) != get_object_fingerprint(lambda x: x),
+        "Expected different bytecode to change the fingerprint",
+    )
+    assert_with_msg(
+        get_object_fingerprint({"b", "a"}) == "{'a', 'b'}",
+        "Expected sets to be sorted",
+    )
+    fingerprint = get_object_fingerprint((1, ["a"]))
+    assert_with_msg(
+        fingerprint == "(1, ('a'))",
+        f"Expected sequences element by element, got {fingerprint}",
+    )
+
+
+def test_get_callable_fingerprint() -> None:
+    """Test func for get_callable_fingerprint."""
+    assert_with_msg(
+        get_callable_fingerprint(lambda s: s * 2)
+        != get_callable_fingerprint(lambda s: s * 3),
+        "Expected different constants to change the fingerprint",
+    )
+
+    def scale(s: pl.Series, factor: int = 2) -> pl.Series:
+        return s * factor
+
+    def get_scale(factor: int) -> Any:
+        return lambda s: s * factor
+
+    others = {
+        get_callable_fingerprint(get_scale(3)),
+        get_callable_fingerprint(scale),
+    }
+    scale.__defaults__ = (3,)
+    others.add(get_callable_fingerprint(scale))
+    assert_with_msg(
+        get_callable_fingerprint(get_scale(2)) not in others and len(others) == 3,  # noqa: PLR2004
+        "Expected closures and defaults to change the fingerprint",
+    )
+
+    # methods are fingerprinted without the logging wrapper of the metaclass
+    method = MyScaledCleaningDF.scale_col
+    assert_with_msg(
+        get_callable_fingerprint(method)
+        == get_callable_fingerprint(
+            inspect.unwrap(MyScaledCleaningDF.__dict__["scale_col"].__func__)
+        ),
+        "Expected the wrapped method to be fingerprinted",
+    )
+
+
+def test_get_code_fingerprint() -> None:
+    """Test func for get_code_fingerprint."""
+
+    def get_lower() -> Any:
+        return lambda s: s.str.to_lowercase()
+
+    def get_upper() -> Any:
+        return lambda s: s.str.to_uppercase()
+
+    fingerprint = get_code_fingerprint(get_lower.__code__)
+    assert_with_msg(
+        fingerprint == get_code_fingerprint(get_lower.__code__),
+        "Expected a stable fingerprint",
+    )
+    assert_with_msg(
+        fingerprint != get_code_fingerprint(get_upper.__code__),
+        "Expected called attributes of nested code to change the fingerprint",
+    )
@@ -0,0 +1,537 @@
+"""Benchmark utilities to measure the throughput of CleaningDF.
+
+This module provides a synthetic CleaningDF subclass, a generator for dirty
+data of any size and functions that run the cleaning pipeline with profiling
+and report rows per second and the additional peak memory of every stage and
+the full clean(). Results can be saved to a csv or parquet file and compared
+across versions.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, ClassVar, Self, cast
+
+import polars as pl
+
+from winiutils.src.data.dataframe.cleaning import (
+    CleaningDF,
+    CleaningOptions,
+    CleaningProfile,
+)
+
+RAW_PREFIX = "raw_"
+
+FULL_CLEAN_STAGE = "clean"
+
+STATM_PATH = Path("/proc/self/statm")
+
+RSS_SAMPLE_INTERVAL = 0.001
+
+
+class BenchmarkCleaningDF(CleaningDF):
+    """Synthetic CleaningDF that exercises every stage of the pipeline.
+
+    The number of float columns is set by N_FLOAT_COLS,
+    use with_float_cols() to create a variant with a different count.
+    """
+
+    STR_COL = "str_col"
+    INT_COL = "int_col"
+    BOOL_COL = "bool_col"
+
+    N_FLOAT_COLS: ClassVar[int] = 1
+
+    @classmethod
+    def with_float_cols(cls, n_float_cols: int) -> type[Self]:
+        """Create a subclass with the given number of float columns.
+
+        Args:
+            n_float_cols: Number of float columns
+
+        Returns:
+            type[Self]: Subclass with N_FLOAT_COLS set to n_float_cols
+        """
+        return type(
+            f"{cls.__name__}{n_float_cols}", (cls,), {"N_FLOAT_COLS": n_float_cols}
+        )
+
+    @classmethod
+    def get_float_col_names(cls) -> tuple[str, ...]:
+        """Get the names of the float columns.
+
+        Returns:
+            tuple[str, ...]: float_col_0 to float_col_{N_FLOAT_COLS - 1}
+        """
+        return tuple(f"float_col_{i}" for i in range(cls.N_FLOAT_COLS))
+
+    @classmethod
+    def get_rename_map(cls) -> dict[str, str]:
+        """Map every column to its raw name with the RAW_PREFIX."""
+        return {col: f"{RAW_PREFIX}{col}" for col in cls.get_col_dtype_map()}
+
+    @classmethod
+    def get_col_dtype_map(cls) -> dict[str, type[pl.DataType]]:
+        """Define a string, an int, a bool and the float columns."""
+        return {
+            cls.STR_COL: pl.Utf8,
+            cls.INT_COL: pl.Int64,
+            cls.BOOL_COL: pl.Boolean,
+            **dict.fromkeys(cls.get_float_col_names(), pl.Float64),
+        }
+
+    @classmethod
+    def get_drop_null_subsets(cls) -> tuple[tuple[str, ...], ...]:
+        """Drop rows without a key."""
+        return ((cls.STR_COL, cls.INT_COL),)
+
+    @classmethod
+    def get_fill_null_map(cls) -> dict[str, Any]:
+        """Fill all columns with their zero value."""
+        return {
+            cls.STR_COL: "",
+            cls.INT_COL: 0,
+            cls.BOOL_COL: False,
+            **dict.fromkeys(cls.get_float_col_names(), 0.0),
+        }
+
+    @classmethod
+    def get_sort_cols(cls) -> tuple[tuple[str, bool], ...]:
+        """Sort by the key columns."""
+        return ((cls.INT_COL, False), (cls.STR_COL, False))
+
+    @classmethod
+    def get_unique_subsets(cls) -> tuple[tuple[str, ...], ...]:
+        """Deduplicate by the key columns."""
+        return ((cls.STR_COL, cls.INT_COL),)
+
+    @classmethod
+    def get_no_null_cols(cls) -> tuple[str, ...]:
+        """Require the key columns."""
+        return (cls.STR_COL, cls.INT_COL)
+
+    @classmethod
+    def get_col_converter_map(cls) -> dict[str, Any]:
+        """Lowercase the string column and skip all other columns."""
+        return {
+            cls.STR_COL: cls.lower_expr,
+            cls.INT_COL: cls.skip_col_converter,
+            cls.BOOL_COL: cls.skip_col_converter,
+            **dict.fromkeys(cls.get_float_col_names(), cls.skip_col_converter),
+        }
+
+    @classmethod
+    def get_add_on_duplicate_cols(cls) -> tuple[str, ...]:
+        """Sum the first float column of duplicates."""
+        return cls.get_float_col_names()[:1]
+
+    @classmethod
+    def get_col_precision_map(cls) -> dict[str, int]:
+        """Round all float columns to 2 decimals."""
+        return dict.fromkeys(cls.get_float_col_names(), 2)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the BenchmarkCleaningDF and execute the cleaning pipeline.
+
+        Args:
+            *args: Positional arguments passed to CleaningDF
+            **kwargs: Keyword arguments passed to CleaningDF
+        """
+        self.peak_rss_delta_by_stage: dict[str, int | None] = {}
+        super().__init__(*args, **kwargs)
+
+    @contextmanager
+    def profile_stage(self, name: str) -> Generator[None, None, None]:
+        """Profile a stage and record the additional memory it needed at its peak.
+
+        Args:
+            name: Name of the stage in the report
+
+        Yields:
+            None: Control to the stage
+        """
+        if self.profile is None:
+            yield
+            return
+        with super().profile_stage(name), RssSampler() as sampler:
+            yield
+        self.peak_rss_delta_by_stage[name] = sampler.get_peak_delta()
+
+
+class RssSampler:
+    """Sample the resident set size of the process while a block runs.
+
+    The peak RSS of the process only grows, so it cannot be attributed to
+    a single stage. The sampler records the current RSS when the block is
+    entered and the highest RSS that a background thread observes until
+    the block exits. Polars releases the GIL while it computes, so the thread
+    keeps sampling during the stages. The delta is the memory the block needed
+    on top of what the process already held, memory that earlier blocks freed
+    but the allocator kept is reused without being counted again. Usage:
+
+        with RssSampler() as sampler:
+            ...
+        sampler.get_peak_delta()
+    """
+
+    __slots__ = ("interval", "peak_rss", "start_rss", "stop_event", "thread")
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL) -> None:
+        """Initialize the sampler without starting it.
+
+        Args:
+            interval: Seconds between two samples
+        """
+        self.interval = interval
+        self.start_rss: int | None = None
+        self.peak_rss: int | None = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.sample_until_stopped, daemon=True)
+
+    def __enter__(self) -> Self:
+        """Record the current RSS and start sampling.
+
+        Returns:
+            Self: The running sampler
+        """
+        self.start_rss = self.peak_rss = get_current_rss()
+        if self.start_rss is not None:
+            self.thread.start()
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Stop sampling and take a last sample."""
+        if self.thread.is_alive():
+            self.stop_event.set()
+            self.thread.join()
+        self.sample()
+
+    def sample_until_stopped(self) -> None:
+        """Take a sample every interval seconds until the block exits."""
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Update the peak with the current RSS."""
+        rss = get_current_rss()
+        if rss is not None and self.peak_rss is not None:
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def get_peak_delta(self) -> int | None:
+        """Get the additional memory the block needed at its peak.
+
+        Returns:
+            int | None: Highest RSS during the block minus the RSS before it
+                in bytes or None if the RSS is not available
+        """
+        if self.start_rss is None or self.peak_rss is None:
+            return None
+        return self.peak_rss - self.start_rss
+
+
+def get_current_rss() -> int | None:
+    """Get the current resident set size of the process.
+
+    Reads /proc/self/statm, which is cheap enough to sample every millisecond.
+
+    Returns:
+        int | None: Current RSS in bytes or None on platforms without /proc,
+            e.g. Windows and macOS
+    """
+    try:
+        resident_pages = int(STATM_PATH.read_text().split()[1])
+    except OSError:
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def get_uniform_expr(seed: int) -> pl.Expr:
+    """Build an expression of pseudo random floats in [0, 1) for each row.
+
+    Hashes the row index, so the values are reproducible for a seed and
+    can be generated for any number of rows without Python loops.
+
+    Args:
+        seed: Seed of the hash
+
+    Returns:
+        pl.Expr: Expression of uniform pseudo random floats
+    """
+    max_value = 2**32
+    return (pl.int_range(pl.len()).hash(seed) % max_value) / max_value
+
+
+def generate_benchmark_data(  # noqa: PLR0913
+    n_rows: int,
+    *,
+    null_rate: float = 0.0,
+    duplicate_rate: float = 0.0,
+    whitespace: bool = False,
+    n_float_cols: int = 1,
+    seed: int = 0,
+) -> pl.DataFrame:
+    """Generate dirty raw data for BenchmarkCleaningDF.
+
+    Args:
+        n_rows: Number of rows
+        null_rate: Share of null values in every column
+        duplicate_rate: Share of rows that repeat the key of an earlier row
+        whitespace: If True, pad the strings with whitespace
+        n_float_cols: Number of float columns
+        seed: Seed of the pseudo random values
+
+    Returns:
+        pl.DataFrame: Data with the raw column names of BenchmarkCleaningDF
+    """
+    cleaning_df_cls = BenchmarkCleaningDF.with_float_cols(n_float_cols)
+    row_index = pl.int_range(pl.len())
+    key = (
+        pl.when(get_uniform_expr(seed) < duplicate_rate)
+        .then((get_uniform_expr(seed + 1) * row_index).floor().cast(pl.Int64))
+        .otherwise(row_index)
+    )
+    text = pl.format("Key {}", key)
+    if whitespace:
+        text = pl.format("  {}\t", text)
+    cols = {
+        cleaning_df_cls.STR_COL: text,
+        cleaning_df_cls.INT_COL: key,
+        cleaning_df_cls.BOOL_COL: get_uniform_expr(seed + 2) < 0.5,  # noqa: PLR2004
+        **{
+            col: get_uniform_expr(seed + 3 + i) * 1000
+            for i, col in enumerate(cleaning_df_cls.get_float_col_names())
+        },
+    }
+    rename_map = cleaning_df_cls.get_rename_map()
+    return (
+        pl.LazyFrame({"__row": pl.int_range(n_rows, eager=True)})
+        .select(
+            pl.when(get_uniform_expr(seed + 100 + i) < null_rate)
+            .then(None)
+            .otherwise(expr)
+            .alias(rename_map[col])
+            for i, (col, expr) in enumerate(cols.items())
+        )
+        .collect()
+    )
+
+
+def benchmark_clean(
+    cleaning_df_cls: type[BenchmarkCleaningDF],
+    data: pl.DataFrame,
+    *,
+    lazy: bool = False,
+) -> pl.DataFrame:
+    """Benchmark the full clean() and every stage of it on the given data.
+
+    The full pipeline is timed once without profiling, then it runs again
+    with profiling to measure the stages. The memory of the full clean is
+    measured first, so it includes the memory the allocator keeps for reuse,
+    which the stages of the second run do not need again.
+
+    Args:
+        cleaning_df_cls: BenchmarkCleaningDF class to clean the data with
+        data: Raw data to clean
+        lazy: If True, benchmark the lazy mode of clean()
+
+    Returns:
+        pl.DataFrame: One row per stage and one for the full clean with
+            the columns n_rows, stage, seconds, rows_per_second,
+            estimated_size and peak_rss_delta, the additional memory
+            at the peak of the stage, see RssSampler
+    """
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        cleaned = cleaning_df_cls(data, options=CleaningOptions(lazy=lazy))
+        seconds = time.perf_counter() - start
+    full_clean = {
+        "stage": FULL_CLEAN_STAGE,
+        "seconds": seconds,
+        "rows_in": data.height,
+        "estimated_size": int(cleaned.df.estimated_size()),
+        "peak_rss_delta": sampler.get_peak_delta(),
+    }
+    del cleaned
+    profiled = cleaning_df_cls(data, options=CleaningOptions(lazy=lazy, profile=True))
+    profile = cast("CleaningProfile", profiled.profile)
+    stages = profile.to_df().with_columns(
+        pl.col("stage")
+        .replace_strict(profiled.peak_rss_delta_by_stage, return_dtype=pl.Int64)
+        .alias("peak_rss_delta")
+    )
+    return (
+        pl.concat(
+            [
+                stages.drop("rows_out"),
+                pl.DataFrame([full_clean], schema=stages.drop("rows_out").schema),
+            ]
+        )
+        .with_columns(
+            pl.lit(data.height, dtype=pl.Int64).alias("n_rows"),
+            (pl.col("rows_in") / pl.col("seconds")).alias("rows_per_second"),
+        )
+        .select(
+            "n_rows",
+            "stage",
+            "seconds",
+            "rows_per_second",
+            "estimated_size",
+            "peak_rss_delta",
+        )
+    )
+
+
+def round_col_loop(col: pl.Series, precision: int) -> pl.Series:
+    """Round a float column with the sequential Kahan loop in Python.
+
+    Reference for CleaningDF.round_col(), which computes the same rounding
+    natively in Polars and only differs on ties, see CleaningDF.round_expr().
+
+    Args:
+        col: Float column without nulls
+        precision: Number of decimal places
+
+    Returns:
+        pl.Series: Series with values rounded to precision
+    """
+    error = 0.0
+    values = []
+    for value in col.to_list():
+        corrected = value + error
+        rounded = round(corrected, precision)
+        error = corrected - rounded
+        values.append(rounded)
+    return pl.Series(name=col.name, values=values, dtype=col.dtype)
+
+
+def benchmark_round_col(n_rows: int, precision: int = 2, seed: int = 0) -> pl.DataFrame:
+    """Benchmark CleaningDF.round_col() against the Python Kahan loop.
+
+    Args:
+        n_rows: Number of random floats to round
+        precision: Number of decimal places
+        seed: Seed of the pseudo random values
+
+    Returns:
+        pl.DataFrame: One row for the loop and one for round_col() with
+            the columns n_rows, method, seconds and rows_per_second
+    """
+    col = (
+        pl.LazyFrame({"__row": pl.int_range(n_rows, eager=True)})
+        .select((get_uniform_expr(seed) * 1000).alias("x"))
+        .collect()
+        .to_series()
+    )
+    results = []
+    for method, func in (
+        ("loop", round_col_loop),
+        ("round_col", BenchmarkCleaningDF.round_col),
+    ):
+        start = time.perf_counter()
+        func(col, precision)
+        results.append({"method": method, "seconds": time.perf_counter() - start})
+    return pl.DataFrame(results).select(
+        pl.lit(n_rows, dtype=pl.Int64).alias("n_rows"),
+        "method",
+        "seconds",
+        (n_rows / pl.col("seconds")).alias("rows_per_second"),
+    )
+
+
+def run_benchmark_suite(  # noqa: PLR0913
+    row_counts: Iterable[int] = (10**4, 10**5, 10**6),
+    *,
+    null_rate: float = 0.05,
+    duplicate_rate: float = 0.1,
+    whitespace: bool = True,
+    n_float_cols: int = 2,
+    lazy: bool = False,
+    path: str | Path | None = None,
+) -> pl.DataFrame:
+    """Benchmark CleaningDF for each row count.
+
+    Pass larger row counts (up to 10**8) on hosts with enough memory.
+
+    Args:
+        row_counts: Numbers of rows to benchmark
+        null_rate: Share of null values in every column
+        duplicate_rate: Share of rows that repeat the key of an earlier row
+        whitespace: If True, pad the strings with whitespace
+        n_float_cols: Number of float columns
+        lazy: If True, benchmark the lazy mode of clean()
+        path: If given, the results are appended to this csv or parquet file,
+            see save_benchmark_results()
+
+    Returns:
+        pl.DataFrame: Results of benchmark_clean() for all row counts
+    """
+    cleaning_df_cls = BenchmarkCleaningDF.with_float_cols(n_float_cols)
+    results = pl.concat(
+        benchmark_clean(
+            cleaning_df_cls,
+            generate_benchmark_data(
+                n_rows,
+                null_rate=null_rate,
+                duplicate_rate=duplicate_rate,
+                whitespace=whitespace,
+                n_float_cols=n_float_cols,
+            ),
+            lazy=lazy,
+        )
+        for n_rows in row_counts
+    )
+    if path is not None:
+        results = save_benchmark_results(results, path)
+    return results
+
+
+def get_winiutils_version() -> str:
+    """Get the installed version of winiutils.
+
+    Returns:
+        str: The version or "unknown" if the package is not installed
+    """
+    try:
+        return version("winiutils")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def save_benchmark_results(results: pl.DataFrame, path: str | Path) -> pl.DataFrame:
+    """Append benchmark results to a csv or parquet file.
+
+    Adds the winiutils and polars versions and a UTC timestamp to every row,
+    so runs across versions can be compared.
+
+    Args:
+        results: Results of benchmark_clean() or run_benchmark_suite()
+        path: csv or parquet file, created if it does not exist
+
+    Returns:
+        pl.DataFrame: The saved results including the earlier runs
+
+    Raises:
+        ValueError: If the suffix of path is not .csv or .parquet
+    """
+    path = Path(path)
+    if path.suffix not in (".csv", ".parquet"):
+        msg = f"Unsupported file suffix {path.suffix}, use .csv or .parquet"
+        raise ValueError(msg)
+    results = results.with_columns(
+        pl.lit(get_winiutils_version()).alias("winiutils_version"),
+        pl.lit(pl.__version__).alias("polars_version"),
+        pl.lit(datetime.now(tz=UTC).isoformat()).alias("timestamp"),
+    )
+    if path.exists():
+        previous = pl.read_csv(path) if path.suffix == ".csv" else pl.read_parquet(path)
+        results = pl.concat([previous, results], how="diagonal_relaxed")
+    if path.suffix == ".csv":
+        results.write_csv(path)
+    else:
+        results.write_parquet(path)
+    return results
@@ -0,0 +1,384 @@
+"""A local cache of cleaned CleaningDF outputs keyed by content fingerprints.
+
+The same raw data is often cleaned again by several jobs. This module stores
+cleaned frames as uncompressed Arrow IPC files in a cache directory. The key of
+an entry combines a fingerprint of the raw data with a fingerprint of the
+configuration of the CleaningDF subclass, so changing either the data or any
+get_* map of the subclass results in a new entry. Cache hits are loaded through
+a memory map instead of running clean() again and the least recently used
+entries are evicted once the cache exceeds its size limit.
+"""
+
+import hashlib
+import inspect
+import io
+import os
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from types import CodeType
+from typing import Any
+
+import polars as pl
+
+from winiutils.src.data.dataframe.benchmark import get_winiutils_version
+from winiutils.src.data.dataframe.cleaning import CleaningDF, CleaningOptions
+from winiutils.src.data.structures.text.string import get_reusable_hash
+
+CACHE_SUFFIX = ".arrow"
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "winiutils" / "cleaning"
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+FILE_CHUNK_SIZE = 1024**2
+
+
+class CleaningCache:
+    """Cache of cleaned frames in a local directory with size based LRU eviction.
+
+    Example:
+        cache = CleaningCache("/tmp/cleaning_cache", max_bytes=10 * 1024**3)
+        cleaned = cache.clean_file(MyDataCleaner, "vendor.csv")
+    """
+
+    __slots__ = ("cache_dir", "max_bytes")
+
+    def __init__(
+        self,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Initialize the cache and create its directory.
+
+        Args:
+            cache_dir: Directory the cached frames are stored in
+            max_bytes: Size limit of all cached frames together
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def clean[T: CleaningDF](
+        self,
+        cleaning_df_cls: type[T],
+        *args: Any,
+        options: CleaningOptions | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Create a CleaningDF from in memory data or load it from the cache.
+
+        Args:
+            cleaning_df_cls: CleaningDF subclass to clean the data with
+            *args: Positional arguments passed to pl.DataFrame constructor
+            options: Options passed to the CleaningDF constructor,
+                they are part of the key
+            **kwargs: Additional keyword arguments passed to pl.DataFrame constructor
+
+        Returns:
+            T: The cleaned and checked CleaningDF
+        """
+        raw_df = pl.DataFrame(*args, **kwargs)
+        return self.get_or_clean(
+            cleaning_df_cls,
+            get_data_fingerprint(raw_df),
+            lambda: cleaning_df_cls(raw_df, options=options),
+            options,
+        )
+
+    def clean_file[T: CleaningDF](
+        self,
+        cleaning_df_cls: type[T],
+        source: str | Path,
+        options: CleaningOptions | None = None,
+    ) -> T:
+        """Create a CleaningDF from a raw file or load it from the cache.
+
+        The file is fingerprinted by its bytes, which is much faster than parsing
+        it, so a cache hit never reads the file into a DataFrame.
+
+        Args:
+            cleaning_df_cls: CleaningDF subclass to clean the file with
+            source: Path of a csv, parquet or ipc file with the raw columns
+            options: Options passed to the CleaningDF constructor,
+                they are part of the key
+
+        Returns:
+            T: The cleaned and checked CleaningDF
+        """
+        return self.get_or_clean(
+            cleaning_df_cls,
+            get_file_fingerprint(source),
+            lambda: cleaning_df_cls.from_raw_lazy(
+                cleaning_df_cls.scan_raw_file(source), options=options
+            ),
+            options,
+        )
+
+    def get_or_clean[T: CleaningDF](
+        self,
+        cleaning_df_cls: type[T],
+        data_fingerprint: str,
+        clean_func: Callable[[], T],
+        options: CleaningOptions | None = None,
+    ) -> T:
+        """Load the cached frame of a key or clean the data and cache the result.
+
+        Args:
+            cleaning_df_cls: CleaningDF subclass the data is cleaned with
+            data_fingerprint: Fingerprint of the raw data
+            clean_func: Function that cleans the data on a cache miss
+            options: Options of the cleaning, they are part of the key
+
+        Returns:
+            T: The cleaned and checked CleaningDF
+        """
+        key = self.get_key(cleaning_df_cls, data_fingerprint, options)
+        compacted = options is not None and options.compact
+        cached = self.load(cleaning_df_cls, key, compacted=compacted)
+        if cached is not None:
+            return cached
+        cleaned = clean_func()
+        self.save(key, cleaned)
+        return cleaned
+
+    @classmethod
+    def get_key(
+        cls,
+        cleaning_df_cls: type[CleaningDF],
+        data_fingerprint: str,
+        options: CleaningOptions | None = None,
+    ) -> str:
+        """Combine the fingerprints of the data and the cleaning into a cache key.
+
+        Args:
+            cleaning_df_cls: CleaningDF subclass the data is cleaned with
+            data_fingerprint: Fingerprint of the raw data
+            options: Options of the cleaning, they are part of the key
+
+        Returns:
+            str: Hexadecimal cache key
+        """
+        return get_reusable_hash(
+            (
+                data_fingerprint,
+                get_config_fingerprint(cleaning_df_cls),
+                get_object_fingerprint((options or CleaningOptions()).to_dict()),
+            )
+        )
+
+    def get_path(self, key: str) -> Path:
+        """Get the path of the cached frame of a key.
+
+        Args:
+            key: Cache key from get_key()
+
+        Returns:
+            Path: Path of the Arrow IPC file
+        """
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
+
+    def load[T: CleaningDF](
+        self, cleaning_df_cls: type[T], key: str, *, compacted: bool = False
+    ) -> T | None:
+        """Load a cached frame through a memory map and mark it as recently used.
+
+        Args:
+            cleaning_df_cls: CleaningDF subclass the frame was cleaned with
+            key: Cache key from get_key()
+            compacted: If True, the frame was cleaned with compact options
+
+        Returns:
+            T | None: The cached CleaningDF or None on a cache miss
+        """
+        path = self.get_path(key)
+        if not path.exists():
+            return None
+        os.utime(path)
+        return cleaning_df_cls.read_ipc(path, compacted=compacted)
+
+    def save(self, key: str, cleaned: CleaningDF) -> None:
+        """Store a cleaned frame with CleaningDF.write_ipc() and evict old entries.
+
+        The entry is moved into place atomically,
+        so concurrent jobs never load a partially written entry.
+
+        Args:
+            key: Cache key from get_key()
+            cleaned: CleaningDF to store
+        """
+        cleaned.write_ipc(self.get_path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the size limit is met.
+
+        Entries are ordered by their modification time,
+        which load() updates on every cache hit. The round_carry sidecar
+        of an entry is deleted with it, see CleaningDF.write_ipc().
+        """
+        stats = {path: path.stat() for path in self.cache_dir.glob(f"*{CACHE_SUFFIX}")}
+        total = sum(stat.st_size for stat in stats.values())
+        for path in sorted(stats, key=lambda path: stats[path].st_mtime_ns):
+            if total <= self.max_bytes:
+                return
+            path.unlink(missing_ok=True)
+            CleaningDF.get_round_carry_path(path).unlink(missing_ok=True)
+            total -= stats[path].st_size
+
+
+def get_data_fingerprint(df: pl.DataFrame) -> str:
+    """Fingerprint the content of a DataFrame including its row order.
+
+    The rows are hashed natively by Polars and the row hashes are digested
+    together with the schema. Row hashes can change between Polars versions,
+    which is covered by get_config_fingerprint().
+
+    Args:
+        df: DataFrame to fingerprint
+
+    Returns:
+        str: Hexadecimal fingerprint
+    """
+    digest = hashlib.sha256(str(df.schema).encode("utf-8"))
+    if df.width:
+        buffer = io.BytesIO()
+        df.hash_rows(seed=0).to_frame().write_ipc(buffer, compression="uncompressed")
+        digest.update(buffer.getvalue())
+    return digest.hexdigest()
+
+
+def get_file_fingerprint(source: str | Path) -> str:
+    """Fingerprint the bytes of a file.
+
+    Args:
+        source: Path of the file
+
+    Returns:
+        str: Hexadecimal fingerprint that includes the file suffix
+    """
+    path = Path(source)
+    digest = hashlib.blake2b(path.suffix.encode("utf-8"))
+    with path.open("rb") as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_config_fingerprint(cleaning_df_cls: type[CleaningDF]) -> str:
+    """Fingerprint the configuration of a CleaningDF subclass.
+
+    Covers the class, all maps of its resolved cleaning_config and the Polars
+    and winiutils versions, since an upgrade of either can change the output.
+    Converters are fingerprinted by their name, code, defaults and closure,
+    see get_object_fingerprint(), so editing a converter invalidates the cache.
+
+    Args:
+        cleaning_df_cls: CleaningDF subclass to fingerprint
+
+    Returns:
+        str: Hexadecimal fingerprint
+    """
+    config = cleaning_df_cls.cleaning_config
+    return get_reusable_hash(
+        (
+            pl.__version__,
+            get_winiutils_version(),
+            f"{cleaning_df_cls.__module__}.{cleaning_df_cls.__qualname__}",
+            *(
+                (name, get_object_fingerprint(getattr(config, name)))
+                for name in type(config).__slots__
+            ),
+        )
+    )
+
+
+def get_object_fingerprint(value: object) -> str:
+    """Build a representation of a configuration value that is stable across runs.
+
+    The default repr of functions contains their memory address, so callables
+    are represented by get_callable_fingerprint() instead.
+    Mappings, sequences and sets are represented element by element.
+
+    Args:
+        value: Configuration value to represent
+
+    Returns:
+        str: Stable representation of the value
+    """
+    if isinstance(value, Mapping):
+        items = (
+            f"{get_object_fingerprint(k)}: {get_object_fingerprint(v)}"
+            for k, v in value.items()
+        )
+        return "{" + ", ".join(items) + "}"
+    if isinstance(value, (tuple, list)):
+        return "(" + ", ".join(get_object_fingerprint(v) for v in value) + ")"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(get_object_fingerprint(v) for v in value)) + "}"
+    if isinstance(value, pl.Expr):
+        return str(value)
+    if callable(value):
+        return get_callable_fingerprint(value)
+    return repr(value)
+
+
+def get_callable_fingerprint(value: Callable[..., Any]) -> str:
+    """Build a representation of a function or method that is stable across runs.
+
+    Methods are unwrapped from decorators like the logging wrapper of
+    ABCLoggingMeta, so the function itself is represented by its qualified
+    name, its code, see get_code_fingerprint(), its defaults and the contents
+    of its closure. Callables without code, like classes, are represented
+    by their qualified name only.
+
+    Args:
+        value: Function, method or other callable to represent
+
+    Returns:
+        str: Stable representation of the callable
+    """
+    func = inspect.unwrap(getattr(value, "__func__", value))
+    code = getattr(func, "__code__", None)
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', '')}"
+    if code is None:
+        return name
+    closure = []
+    for cell in getattr(func, "__closure__", None) or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:  # the variable is not assigned yet
+            contents = None
+        # a recursive inner function refers to itself through its closure
+        closure.append(name if contents is func else contents)
+    parts = (
+        get_code_fingerprint(code),
+        get_object_fingerprint(getattr(func, "__defaults__", None)),
+        get_object_fingerprint(getattr(func, "__kwdefaults__", None)),
+        get_object_fingerprint(closure),
+    )
+    return f"{name}:{hashlib.sha256(repr(parts).encode()).hexdigest()}"
+
+
+def get_code_fingerprint(code: CodeType) -> str:
+    """Fingerprint a code object by its bytecode, names and constants.
+
+    The bytecode alone does not cover constants like the 2 in lambda s: s * 2
+    or called attributes like str.to_lowercase, so both are included.
+    Nested code objects of inner functions and lambdas are fingerprinted
+    recursively instead of by their repr, which contains a memory address.
+
+    Args:
+        code: Code object of a function
+
+    Returns:
+        str: Hexadecimal fingerprint
+    """
+    consts = tuple(
+        get_code_fingerprint(const)
+        if isinstance(const, CodeType)
+        else get_object_fingerprint(const)
+        for const in code.co_consts
+    )
+    digest = hashlib.sha256(code.co_code)
+    digest.update(repr((code.co_names, consts)).encode())
+    return digest.hexdigest()
@@ -5,16 +5,374 @@ cleaning operations.
 This module uses polars for dataframe operations and assumes some standards on the data
 """
 
+import json
+import os
+import tempfile
+import time
 from abc import abstractmethod
-from collections.abc import Callable
-from typing import Any
+from collections.abc import (
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import accumulate, chain
+from pathlib import Path
+from types import MappingProxyType
+from typing import IO, Any, ClassVar, Literal, Self, TypeGuard, cast
 
 import polars as pl
 from polars.datatypes.classes import FloatType
+from polars.io.plugins import register_io_source
 
 from winiutils.src.data.structures.dicts import reverse_dict
+from winiutils.src.iterating.concurrent.concurrent import find_max_pools
+from winiutils.src.iterating.concurrent.multiprocessing import multiprocess_loop
+from winiutils.src.iterating.concurrent.multithreading import multithread_loop
 from winiutils.src.oop.mixins.mixin import ABCLoggingMixin
 
+ColConverter = Callable[[pl.Series], pl.Series] | Callable[[pl.Expr], pl.Expr] | pl.Expr
+
+EXPR_CONVERTER_ATTR = "__expr_converter__"
+
+ROW_WISE_CONVERTER_ATTR = "__row_wise_converter__"
+
+CLEAN_STAGES = ("fill_nulls", "convert_cols", "drop_null_subsets", "handle_duplicates")
+
+MOVABLE_STAGES = ("fill_nulls", "convert_cols")
+
+ROW_REDUCING_STAGES = ("drop_null_subsets", "handle_duplicates")
+
+PARTITION_COL = "__partition"
+
+BATCH_INDEX_COL = "__batch_index"
+
+TARGET_INDEX_COL = "__target_index"
+
+RUN_ID_COL = "__run_id"
+
+SORT_RUN_COL = "__sort_run"
+
+SEARCH_SUFFIX = "__search"
+
+ROUND_CARRY_SUFFIX = ".round_carry.json"
+
+DEFAULT_BATCH_SIZE = 100_000
+
+NULL_FLAG_PREFIX = "__null_"
+
+NAN_FLAG_PREFIX = "__nan_"
+
+
+def expr_converter[F: Callable[..., Any]](func: F) -> F:
+    """Mark a function as a converter that builds a pl.Expr.
+
+    Converters in get_col_converter_map() are called with a Series by default,
+    which requires a map_batches Python UDF that Polars can not optimize.
+    A function marked with this decorator is called once with the expression
+    of the column instead and the returned expression is fused with the standard
+    conversions into a single with_columns call.
+
+    Args:
+        func: Function that takes a pl.Expr and returns a pl.Expr
+
+    Returns:
+        The same function, marked as expression converter
+
+    Example:
+        @classmethod
+        @expr_converter
+        def add_one_expr(cls, col: pl.Expr) -> pl.Expr:
+            return col + 1
+    """
+    setattr(func, EXPR_CONVERTER_ATTR, True)
+    return func
+
+
+def is_expr_converter(
+    converter: ColConverter,
+) -> TypeGuard[Callable[[pl.Expr], pl.Expr]]:
+    """Check if a converter was marked with expr_converter.
+
+    Args:
+        converter: Converter from get_col_converter_map()
+
+    Returns:
+        bool: True if the converter builds a pl.Expr
+    """
+    return getattr(converter, EXPR_CONVERTER_ATTR, False) is True
+
+
+def row_wise_converter[F: Callable[..., Any]](func: F) -> F:
+    """Mark a converter whose result for a row only depends on that row.
+
+    Element wise converters such as x + 1 or str.to_lowercase() are row wise,
+    converters that aggregate, shift or cumulate over the column are not.
+    Dropping rows before a row wise converter does not change the converted
+    values of the kept rows, which the optimizing mode of CleaningDF.clean()
+    uses to drop rows before converting them, see get_stage_order().
+    Converters given as pl.Expr can not be marked and are never row wise.
+
+    Args:
+        func: Converter that takes a pl.Series or, combined with expr_converter,
+            a pl.Expr
+
+    Returns:
+        The same function, marked as row wise converter
+
+    Example:
+        @classmethod
+        @row_wise_converter
+        @expr_converter
+        def add_one_expr(cls, col: pl.Expr) -> pl.Expr:
+            return col + 1
+    """
+    setattr(func, ROW_WISE_CONVERTER_ATTR, True)
+    return func
+
+
+def is_row_wise_converter(converter: ColConverter) -> bool:
+    """Check if a converter was marked with row_wise_converter.
+
+    Args:
+        converter: Converter from get_col_converter_map()
+
+    Returns:
+        bool: True if the converter is row wise
+    """
+    return getattr(converter, ROW_WISE_CONVERTER_ATTR, False) is True
+
+
+@contextmanager
+def open_atomic(path: Path) -> Generator[IO[bytes], None, None]:
+    """Open a temporary file that replaces path once the with block succeeds.
+
+    The temporary file gets a unique name in the directory of path,
+    so concurrent writers of the same path in any thread or process never
+    share it, and readers only ever see a complete file at path.
+    If the block raises, the temporary file is deleted.
+
+    Args:
+        path: Path of the file to write
+
+    Yields:
+        IO[bytes]: Binary file to write the content to
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as file:
+        tmp_path = Path(file.name)
+        try:
+            yield file
+        except BaseException:
+            file.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    tmp_path.replace(path)
+
+
+class CleaningConfig:
+    """Resolved configuration of a concrete CleaningDF subclass.
+
+    Holds the results of the get_* configuration classmethods as read only
+    mappings and tuples, so the cleaning stages read plain attributes
+    instead of rebuilding the maps on every call.
+    """
+
+    __slots__ = (
+        "add_on_duplicate_cols",
+        "col_converter_map",
+        "col_dtype_map",
+        "col_names",
+        "col_precision_map",
+        "compact_str_map",
+        "drop_null_subsets",
+        "fill_null_map",
+        "float_cols",
+        "no_null_cols",
+        "rename_map",
+        "sort_cols",
+        "unique_subsets",
+    )
+
+    def __init__(self, cleaning_df_cls: type["CleaningDF"]) -> None:
+        """Resolve and validate the configuration of a CleaningDF subclass.
+
+        Args:
+            cleaning_df_cls: Concrete CleaningDF subclass to resolve
+
+        Raises:
+            KeyError: If any column is missing in the rename, fill null
+                or converter map
+        """
+        cleaning_df_cls.raise_on_missing_cols(cleaning_df_cls.get_rename_map)
+        cleaning_df_cls.raise_on_missing_cols(cleaning_df_cls.get_fill_null_map)
+        cleaning_df_cls.raise_on_missing_cols(cleaning_df_cls.get_col_converter_map)
+        self.rename_map: Mapping[str, str] = MappingProxyType(
+            dict(cleaning_df_cls.get_rename_map())
+        )
+        self.col_dtype_map: Mapping[str, type[pl.DataType]] = MappingProxyType(
+            dict(cleaning_df_cls.get_col_dtype_map())
+        )
+        self.drop_null_subsets = tuple(cleaning_df_cls.get_drop_null_subsets())
+        self.fill_null_map: Mapping[str, Any] = MappingProxyType(
+            dict(cleaning_df_cls.get_fill_null_map())
+        )
+        self.sort_cols = tuple(cleaning_df_cls.get_sort_cols())
+        self.unique_subsets = tuple(cleaning_df_cls.get_unique_subsets())
+        self.no_null_cols = tuple(cleaning_df_cls.get_no_null_cols())
+        self.col_converter_map: Mapping[str, ColConverter] = MappingProxyType(
+            dict(cleaning_df_cls.get_col_converter_map())
+        )
+        self.add_on_duplicate_cols = tuple(cleaning_df_cls.get_add_on_duplicate_cols())
+        self.col_precision_map: Mapping[str, int] = MappingProxyType(
+            dict(cleaning_df_cls.get_col_precision_map())
+        )
+        self.compact_str_map: Mapping[str, tuple[str, ...] | None] = MappingProxyType(
+            dict(cleaning_df_cls.get_compact_str_map())
+        )
+        self.col_names = cleaning_df_cls.get_col_names()
+        self.float_cols = cleaning_df_cls.get_float_cols()
+
+
+class StageProfile:
+    """Measurements of a single stage of the CleaningDF pipeline."""
+
+    __slots__ = ("estimated_size", "name", "rows_in", "rows_out", "seconds")
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        seconds: float,
+        rows_in: int,
+        rows_out: int,
+        estimated_size: int,
+    ) -> None:
+        """Initialize the StageProfile.
+
+        Args:
+            name: Name of the stage
+            seconds: Wall time of the stage in seconds
+            rows_in: Number of rows before the stage
+            rows_out: Number of rows after the stage
+            estimated_size: Estimated size of the frame after the stage in bytes
+        """
+        self.name = name
+        self.seconds = seconds
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.estimated_size = estimated_size
+
+
+class CleaningProfile:
+    """Report of the stages of a profiled CleaningDF pipeline run."""
+
+    def __init__(self) -> None:
+        """Initialize an empty CleaningProfile."""
+        self.stages: list[StageProfile] = []
+
+    def add_stage(self, stage: StageProfile) -> None:
+        """Record a finished stage.
+
+        Args:
+            stage: Measurements of the stage
+        """
+        self.stages.append(stage)
+
+    def to_df(self) -> pl.DataFrame:
+        """Get the report as a Polars DataFrame with one row per stage.
+
+        Returns:
+            pl.DataFrame: DataFrame with the columns
+                stage, seconds, rows_in, rows_out and estimated_size
+        """
+        return pl.DataFrame(
+            {
+                "stage": [stage.name for stage in self.stages],
+                "seconds": [stage.seconds for stage in self.stages],
+                "rows_in": [stage.rows_in for stage in self.stages],
+                "rows_out": [stage.rows_out for stage in self.stages],
+                "estimated_size": [stage.estimated_size for stage in self.stages],
+            },
+            schema={
+                "stage": pl.Utf8,
+                "seconds": pl.Float64,
+                "rows_in": pl.Int64,
+                "rows_out": pl.Int64,
+                "estimated_size": pl.Int64,
+            },
+        )
+
+
+class CleaningOptions:
+    """Options of a single CleaningDF pipeline run.
+
+    Groups the flags that change how the pipeline runs, so the CleaningDF
+    constructor and everything that forwards to it take one options object.
+
+    Example:
+        MyDataCleaner(raw_dataframe, options=CleaningOptions(lazy=True))
+    """
+
+    __slots__ = ("compact", "lazy", "optimize", "presorted", "profile", "round_carry")
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        lazy: bool = False,
+        profile: bool = False,
+        compact: bool = False,
+        presorted: bool = False,
+        round_carry: Mapping[str, float] | None = None,
+        optimize: bool = False,
+    ) -> None:
+        """Initialize the CleaningOptions.
+
+        Args:
+            lazy: If True, run the cleaning stages as one lazy query
+                that is collected once, see CleaningDF.clean()
+            profile: If True, record the wall time, rows and size of every stage
+                in a CleaningProfile, see CleaningDF.profile_stage()
+            compact: If True, store the cleaned data with compact dtypes,
+                see CleaningDF.compact()
+            presorted: If True, declare that the converted data is already sorted
+                by get_sort_cols(), see CleaningDF.clean()
+            round_carry: Kahan rounding state to resume from, e.g. the round_carry
+                of the CleaningDF of the preceding rows, see CleaningDF.round_expr()
+            optimize: If True, drop rows before converting them where that
+                does not change the result, see CleaningDF.clean()
+        """
+        self.lazy = lazy
+        self.profile = profile
+        self.compact = compact
+        self.presorted = presorted
+        self.round_carry = round_carry
+        self.optimize = optimize
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the options as a dict keyed by their keyword argument names.
+
+        Returns:
+            dict[str, Any]: Mapping of option name to value
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def replace(self, **changes: Any) -> "CleaningOptions":
+        """Get a copy of the options with some of them changed.
+
+        Args:
+            **changes: Options to change, keyed by their keyword argument names
+
+        Returns:
+            CleaningOptions: New options with the changes applied
+        """
+        return CleaningOptions(**{**self.to_dict(), **changes})
+
 
 class CleaningDF(ABCLoggingMixin):
     """A base class for cleaning and standardizing dataframes using Polars.
@@ -53,12 +411,43 @@ class CleaningDF(ABCLoggingMixin):
         for reusability and maintainability
     - Use this class to build data cleaning pipelines that can be composed and extended
     - The class automatically converts NaN to null for consistency
+    - The configuration is resolved and validated once when a concrete
+        child class is defined and stored in cleaning_config,
+        so the get_* methods must not depend on runtime state
 
     Example:
         COL_NAME_1 = "col_name_1"
         COL_NAME_2 = "col_name_2"
     """
 
+    cleaning_config: ClassVar[CleaningConfig]
+
+    profile: CleaningProfile | None = None
+
+    compacted: bool = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Resolve and validate the configuration of concrete child classes.
+
+        Runs when a child class is defined. If the class implements all abstract
+        methods, its configuration is resolved once into a CleaningConfig
+        and stored in cleaning_config.
+
+        Args:
+            **kwargs: Keyword arguments passed to super().__init_subclass__
+
+        Raises:
+            KeyError: If any column is missing in the rename, fill null
+                or converter map
+        """
+        super().__init_subclass__(**kwargs)
+        is_abstract = any(
+            getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+            for name in dir(cls)
+        )
+        if not is_abstract:
+            cls.cleaning_config = CleaningConfig(cls)
+
     @classmethod
     @abstractmethod
     def get_rename_map(cls) -> dict[str, str]:
@@ -141,6 +530,7 @@ class CleaningDF(ABCLoggingMixin):
         Returns:
             dict[str, Any]: Dictionary mapping column names to their fill values.
                 The fill value can be any type appropriate for the column.
+                None keeps the nulls of the column, e.g. for drop null subsets.
 
         Example:
             return {
@@ -214,23 +604,28 @@ class CleaningDF(ABCLoggingMixin):
     @abstractmethod
     def get_col_converter_map(
         cls,
-    ) -> dict[str, Callable[[pl.Series], pl.Series]]:
+    ) -> Mapping[str, ColConverter]:
         """Define custom conversion functions for columns.
 
         This abstract method specifies custom transformations to apply to columns
-        after standard conversions (string stripping, float rounding). Each function
-        receives a Polars Series and returns a transformed Series. Use
+        after standard conversions (string stripping, float rounding). Use
         skip_col_converter as a placeholder for columns that don't need custom
-        conversion.
+        conversion. A converter can be:
+        - a function marked with expr_converter that takes and returns a pl.Expr,
+            it is fused with the standard conversions and fully optimized by Polars
+        - a pl.Expr, it is evaluated after all function converters
+        - any other function that takes and returns a pl.Series,
+            it is run as a map_batches Python UDF and should be used only
+            for conversions that can not be expressed with Polars expressions
 
         Returns:
-            dict[str, Callable[[pl.Series], pl.Series]]: Dictionary mapping column names
-                to their conversion functions. Each function takes a Series and returns
-                a transformed Series.
+            Mapping[str, ColConverter]: Dictionary mapping column names
+                to their converters.
 
         Example:
             return {
-                "email": lambda s: s.str.to_lowercase(),
+                "email": self.lower_expr,
+                "domain": pl.col("email").str.split("@").list.last(),
                 "phone": self.parse_phone_number,
                 "created_at": self.skip_col_converter,  # No custom conversion
             }
@@ -274,33 +669,99 @@ class CleaningDF(ABCLoggingMixin):
             }
         """
 
+    @classmethod
+    def get_compact_str_map(cls) -> Mapping[str, tuple[str, ...] | None]:
+        """Define low cardinality string columns to encode in compact mode.
+
+        Override this method to choose the string columns that compact()
+        encodes as pl.Enum with the given categories
+        or as pl.Categorical if the categories are None.
+        By default no string column is encoded.
+
+        Returns:
+            Mapping[str, tuple[str, ...] | None]: Dictionary mapping string column
+                names to their Enum categories or None for Categorical.
+
+        Example:
+            return {
+                "currency": ("EUR", "USD"),
+                "country": None,
+            }
+        """
+        return {}
+
     def __init__(
         self,
         *args: Any,
+        options: CleaningOptions | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the CleaningDF and execute the cleaning pipeline.
 
-        Creates a Polars DataFrame with NaN values automatically converted to null,
-        then immediately executes the full cleaning pipeline.
-        nan_to_null is set to True to always
-        schema is set to the dtype map to always have the correct dtypes
+        Creates a Polars DataFrame, renames and selects the schema columns,
+        casts them to the dtype map and converts NaN values to null.
+        Then immediately executes the full cleaning pipeline.
+        The casts are applied as expressions on the renamed frame,
+        so the data is not copied into a second DataFrame.
 
         Args:
             *args: Positional arguments passed to pl.DataFrame constructor
+            options: Options of the pipeline run, e.g. lazy or profile,
+                defaults to CleaningOptions()
             **kwargs: Additional keyword arguments passed to pl.DataFrame constructor
         """
+        if options is None:
+            options = CleaningOptions()
+        if options.profile:
+            self.profile = CleaningProfile()
         # create a temp df for standardization and accepting all ploars arg and kwargs
-        temp_df = pl.DataFrame(*args, **kwargs)
-        temp_df = self.rename_cols(temp_df)
-        temp_df = self.drop_cols(temp_df)
+        self.df = pl.DataFrame(*args, **kwargs)
+        with self.profile_stage("rename_cols"):
+            self.df = self.rename_cols(self.df)
+        with self.profile_stage("drop_cols"):
+            self.df = self.drop_cols(self.df)
+        with self.profile_stage("cast_cols"):
+            self.df = self.cast_cols(self.df)
+        self.clean(
+            lazy=options.lazy,
+            presorted=options.presorted,
+            round_carry=options.round_carry,
+            optimize=options.optimize,
+        )
+        if options.compact:
+            with self.profile_stage("compact"):
+                self.compact()
+
+    @contextmanager
+    def profile_stage(self, name: str) -> Generator[None, None, None]:
+        """Record the stage run inside the with block if profiling is enabled.
+
+        Measures the wall time of the block and the height of self.df
+        before and after it as well as its estimated size after it.
+        Without profiling the block runs without any measurement.
 
-        # enforce standard kwargs and create the final df
-        kwargs["data"] = temp_df.to_dict(as_series=True)
-        kwargs["nan_to_null"] = True
-        kwargs["schema"] = self.get_col_dtype_map()
-        self.df = pl.DataFrame(**kwargs)
-        self.clean()
+        Args:
+            name: Name of the stage in the report
+
+        Yields:
+            None: Control to the stage
+        """
+        if self.profile is None:
+            yield
+            return
+        rows_in = self.df.height
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self.profile.add_stage(
+            StageProfile(
+                name=name,
+                seconds=seconds,
+                rows_in=rows_in,
+                rows_out=self.df.height,
+                estimated_size=int(self.df.estimated_size()),
+            )
+        )
 
     @classmethod
     def get_col_names(cls) -> tuple[str, ...]:
@@ -313,7 +774,27 @@ class CleaningDF(ABCLoggingMixin):
         """
         return tuple(cls.get_col_dtype_map().keys())
 
-    def clean(self) -> None:
+    @classmethod
+    def get_float_cols(cls) -> tuple[str, ...]:
+        """Get the names of all float columns from the dtype map.
+
+        Returns:
+            tuple[str, ...]: Tuple of float column names.
+        """
+        return tuple(
+            col
+            for col, dtype in cls.get_col_dtype_map().items()
+            if issubclass(dtype, FloatType)
+        )
+
+    def clean(
+        self,
+        *,
+        lazy: bool = False,
+        presorted: bool = False,
+        round_carry: Mapping[str, float] | None = None,
+        optimize: bool = False,
+    ) -> None:
         """Execute the complete data cleaning pipeline.
 
         Applies all cleaning operations in the following order:
@@ -327,174 +808,1877 @@ class CleaningDF(ABCLoggingMixin):
         8. Validate data quality
 
         This method is automatically called during __init__.
+
+        In lazy mode steps 3-7 are not applied one by one to self.df.
+        Instead they are chained into a single pl.LazyFrame query via
+        get_clean_plan() that is collected only once. This avoids materializing
+        a full copy of the frame per stage and lets Polars optimize across
+        stages. Note that overrides of the eager stage methods (e.g. fill_nulls)
+        are not used in lazy mode, override their *_lazy counterparts instead.
+
+        If the converted data is already sorted by get_sort_cols(), steps 6 and 7
+        take a linear fast path, see dedupe_subset_lazy() and sort_cols_lazy().
+        In eager mode the sortedness is detected with is_sorted_df() unless
+        presorted declares it, in lazy mode it has to be declared.
+
+        The Kahan rounding of float columns starts from round_carry and the state
+        after all rows is stored in self.round_carry, so cleaning the rows
+        in several parts rounds like cleaning them in one pass.
+
+        In optimizing mode steps 5 and 6 run before steps 3 and 4 wherever
+        get_stage_order() proves that this does not change the result,
+        so rows that are dropped anyway are never filled or converted.
+
+        When profiling, every stage is recorded with profile_stage().
+        In lazy mode steps 3-7 are recorded as the single stage clean_plan.
+
+        Args:
+            lazy: If True, run steps 3-7 as one lazy query
+            presorted: If True, declare that the data is sorted by get_sort_cols()
+                after step 4, which skips the detection
+            round_carry: Kahan rounding state to resume from, see round_expr()
+            optimize: If True, run steps 5 and 6 as early as is safe
         """
-        self.fill_nulls()
-        self.convert_cols()
-        self.drop_null_subsets()
-        self.handle_duplicates()
-        self.sort_cols()
+        if lazy:
+            with self.profile_stage("clean_plan"):
+                lf = self.df.lazy()
+                self.df, carry_df = pl.collect_all(
+                    [
+                        self.get_clean_plan(
+                            lf,
+                            presorted=presorted,
+                            round_carry=round_carry,
+                            optimize=optimize,
+                        ),
+                        self.get_round_carry_plan(
+                            self.fill_nulls_lazy(lf), round_carry
+                        ),
+                    ]
+                )
+                self.round_carry = self.to_round_carry(carry_df)
+            self.check()
+            return
+        for stage in self.get_stage_order(optimize=optimize):
+            if stage == "convert_cols":
+                self.convert_cols(round_carry=round_carry)
+            elif stage == "handle_duplicates":
+                with self.profile_stage("is_sorted_df"):
+                    presorted = presorted or self.is_sorted_df(self.df)
+                with self.profile_stage(stage):
+                    self.handle_duplicates(presorted=presorted)
+            else:
+                with self.profile_stage(stage):
+                    getattr(self, stage)()
+        with self.profile_stage("sort_cols"):
+            self.sort_cols(presorted=presorted)
         self.check()
 
     @classmethod
-    def raise_on_missing_cols(
+    def stream_clean(
         cls,
-        map_func: Callable[..., dict[str, Any]],
+        source: str | Path,
+        sink: str | Path,
+        *,
+        external_sort: bool = False,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
     ) -> None:
-        """Validate that all required columns are present in a configuration map.
-
-        Checks that the columns returned by map_func contain all columns in col_names.
-        Raises KeyError if any required columns are missing from the map.
+        """Clean a file that can be larger than memory and write the result to sink.
+
+        Scans source lazily, standardizes it with get_standardize_plan(), cleans it
+        with get_clean_plan() and writes the result with Polars' streaming engine via
+        sink_file(). The written file is then validated with check_lazy(), which
+        also streams. If validation fails the sink file is deleted again.
+
+        Memory is not bounded by the size of the file for every stage.
+        The elementwise stages, the Kahan rounding (a streaming cum_sum) and
+        check_lazy() process the data batch by batch. But handle_duplicates()
+        is a group by that holds one row per distinct key of
+        get_unique_subsets(), so for mostly unique keys it holds about the whole
+        cleaned data. The sort holds all rows as well, unless external_sort is
+        set: Then external_sort() sorts with about chunk_size rows in memory.
+        Custom converters that are not elementwise see all rows at once.
+        So stream_clean() handles files larger than memory only if their
+        distinct keys fit into memory.
 
         Args:
-            map_func: A callable that returns a dict with column names as keys
+            source: Path or glob of csv, parquet or ipc files to clean
+            sink: Path of the parquet or ipc file to write the cleaned data to
+            external_sort: If True, sort with external_sort()
+            chunk_size: Number of rows per spilled chunk of external_sort()
 
         Raises:
-            KeyError: If any required columns are missing from the map
-        """
-        col_names = cls.get_col_names()
-        missing_cols = set(col_names) - set(map_func().keys())
-        if missing_cols:
-            msg = f"Missing columns in {map_func.__name__}: {missing_cols}"
-            raise KeyError(msg)
-
-    def rename_cols(self, temp_df: pl.DataFrame) -> pl.DataFrame:
-        """Rename columns from raw names to standardized names.
-
-        Applies the reverse of get_rename_map() to rename columns from their raw
-        input names to standardized names. Validates that all required columns are
-        present in the rename map.
+            TypeError: If any column has incorrect data type
+            ValueError: If required columns contain nulls or float columns contain NaN
         """
-        self.raise_on_missing_cols(self.get_rename_map)
-        return temp_df.rename(reverse_dict(self.get_rename_map()))
+        lf = cls.get_standardize_plan(cls.scan_file(source))
+        if external_sort:
+            lf = cls.get_clean_plan(lf, sort=False)
+            cls.external_sort(lf, sink, chunk_size=chunk_size)
+        else:
+            cls.sink_file(cls.get_clean_plan(lf), sink)
+        try:
+            cls.check_lazy(cls.scan_file(sink))
+        except (TypeError, ValueError):
+            Path(sink).unlink()
+            raise
 
-    def drop_cols(self, temp_df: pl.DataFrame) -> pl.DataFrame:
-        """Drop columns not in the schema.
+    @classmethod
+    def iter_batches(
+        cls,
+        source: str | Path | pl.LazyFrame,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Clean streamed input and yield the cleaned data in batches.
+
+        Runs the same query as stream_clean() but hands the result to the caller
+        in batches of batch_size rows instead of writing it to a file,
+        so e.g. database writes overlap with the cleaning and the whole
+        result is never in memory. The schema is checked before the query starts
+        and the null and NaN flags of every batch before it is yielded.
+        Use pl.DataFrame.to_arrow() on a batch to get Arrow record batches.
 
-        Selects only the columns defined in get_col_names(), removing any extra
-        columns that may have been in the input data.
-        """
-        return temp_df.select(self.get_col_names())
+        Args:
+            source: Path or glob of csv, parquet or ipc files
+                or a LazyFrame with the raw column names
+            batch_size: Number of rows per batch, the last batch may be smaller
 
-    def fill_nulls(self) -> None:
-        """Fill null values with defaults from the fill null map.
+        Yields:
+            pl.DataFrame: Cleaned and checked batches in the order of the result
 
-        Replaces null values in each column with the corresponding fill value
-        from get_fill_null_map(). Validates that all columns are present in the map.
+        Raises:
+            TypeError: If any column has incorrect data type
+            ValueError: If required columns contain nulls or float columns contain NaN
         """
-        self.raise_on_missing_cols(self.get_fill_null_map)
-        self.df = self.df.with_columns(
-            [
-                pl.col(col_name).fill_null(fill_value)
-                for col_name, fill_value in self.get_fill_null_map().items()
-            ]
+        lf = (
+            source.select(cls.get_raw_col_names())
+            if isinstance(source, pl.LazyFrame)
+            else cls.scan_raw_file(source)
         )
+        lf = cls.get_clean_plan(cls.get_standardize_plan(lf))
+        cls.check_schema(lf.collect_schema())
+        for batch in lf.collect_batches(chunk_size=batch_size, lazy=True):
+            cls.check_values_lazy(batch.lazy())
+            yield batch
 
-    def convert_cols(self) -> None:
-        """Apply standard and custom column conversions.
-
-        Orchestrates both standard conversions (string stripping, float rounding)
-        and custom conversions defined in get_col_converter_map(). Validates that
-        all columns are present in the converter map.
-        """
-        self.raise_on_missing_cols(self.get_col_converter_map)
-        self.standard_convert_cols()
-        self.custom_convert_cols()
-
-    def standard_convert_cols(self) -> None:
-        """Apply standard conversions based on data type.
+    @classmethod
+    def clean_partitioned(
+        cls,
+        *args: Any,
+        n_partitions: int | None = None,
+        partition_col: str | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """Create a CleaningDF by cleaning partitions of the data in parallel.
+
+        Standardizes the data, splits it by the hash of the converted
+        partition column and runs get_clean_plan() on each partition in a separate
+        process via multiprocess_loop. The cleaned partitions are concatenated,
+        sorted by get_sort_cols() and checked.
+        Null-drop is row wise and duplicates always share the partition column
+        because it is part of every unique subset, so the result contains
+        the same rows as a single process clean. Without sort cols the row order
+        is the order of the partitions. The Kahan rounding of float columns
+        carries the error from row to row, so the nulls are filled and the float
+        columns are rounded in the input row order before partitioning,
+        see round_float_cols_lazy(). Rounding rounded values again changes
+        nothing, so the partitions convert them like a single process clean.
+
+        Use this for large frames where UDF bound stages (Series converters)
+        do not saturate all cores in a single Polars process.
 
-        Automatically applies standard transformations:
-        - Utf8 columns: strip leading/trailing whitespace
-        - Float64 columns: round to specified precision using Kahan summation
-        """
-        for col_name, dtype in self.get_col_dtype_map().items():
-            if dtype == pl.Utf8:
-                converter = self.strip_col
-            elif dtype == pl.Float64:
-                converter = self.round_col
-            else:
-                continue
-            self.df = self.df.with_columns(
-                pl.col(col_name).map_batches(converter, return_dtype=dtype)
-            )
+        Args:
+            *args: Positional arguments passed to pl.DataFrame constructor
+            n_partitions: Number of partitions, defaults to the cpu count
+            partition_col: Column to partition by, defaults to get_partition_col()
+            **kwargs: Additional keyword arguments passed to pl.DataFrame constructor
 
-    def custom_convert_cols(self) -> None:
-        """Apply custom conversion functions to columns.
+        Returns:
+            Self: The cleaned and checked CleaningDF
 
-        Applies custom transformations from get_col_converter_map() to each column,
-        skipping columns marked with skip_col_converter.
+        Raises:
+            ValueError: If partition_col is not part of every unique subset
         """
-        self.df = self.df.with_columns(
-            [
-                pl.col(col_name).map_batches(
-                    converter, return_dtype=self.get_col_dtype_map()[col_name]
-                )
-                for col_name, converter in self.get_col_converter_map().items()
-                if converter.__name__ != self.skip_col_converter.__name__
-            ]
+        n_partitions = n_partitions or os.cpu_count() or 1
+        lf = cls.get_standardize_plan(pl.DataFrame(*args, **kwargs).lazy())
+        lf = cls.fill_nulls_lazy(lf)
+        df, carry_df = pl.collect_all(
+            [cls.round_float_cols_lazy(lf), cls.get_round_carry_plan(lf)]
+        )
+        df = df.with_columns(
+            cls.get_partition_keys(df, n_partitions, partition_col).alias(PARTITION_COL)
+        )
+        partitions = df.partition_by(
+            PARTITION_COL, include_key=False, maintain_order=True
+        )
+        cleaned = multiprocess_loop(
+            cls.clean_partition,
+            ((partition,) for partition in partitions),
+            process_args_len=len(partitions),
         )
+        df = cls.sort_cols_lazy(pl.concat(cleaned).lazy()).collect()
+        return cls.from_cleaned_df(df, cls.to_round_carry(carry_df))
 
     @classmethod
-    def strip_col(cls, col: pl.Series) -> pl.Series:
-        """Remove leading and trailing whitespace from string column.
+    def clean_partition(
+        cls,
+        df: pl.DataFrame,
+        round_carry: Mapping[str, float] | None = None,
+    ) -> pl.DataFrame:
+        """Clean a standardized partition, used as worker of clean_partitioned().
 
         Args:
-            col: Polars Series of string type
+            df: Standardized partition of the data
+            round_carry: Kahan rounding state after the preceding partitions
 
         Returns:
-            pl.Series: Series with whitespace stripped
+            pl.DataFrame: Cleaned partition
         """
-        return col.str.strip_chars()
+        return cls.get_clean_plan(df.lazy(), round_carry=round_carry).collect()
 
     @classmethod
-    def lower_col(cls, col: pl.Series) -> pl.Series:
-        """Convert string column to lowercase.
+    def clean_part_rows(
+        cls,
+        df: pl.DataFrame,
+        round_carry: Mapping[str, float] | None = None,
+    ) -> pl.DataFrame:
+        """Fill, convert and null-drop a standardized part, used by clean_many().
+
+        Duplicates are not handled and the part is not sorted,
+        so the caller can do both once over all parts.
 
         Args:
-            col: Polars Series of string type
+            df: Standardized part of the data
+            round_carry: Kahan rounding state after the preceding parts
 
         Returns:
-            pl.Series: Series with all characters converted to lowercase
+            pl.DataFrame: Part with the row wise cleaning stages applied
         """
-        return col.str.to_lowercase()
+        lf = cls.convert_cols_lazy(cls.fill_nulls_lazy(df.lazy()), round_carry)
+        return cls.drop_null_subsets_lazy(lf).collect()
 
     @classmethod
-    def round_col(
+    def get_round_carries(
         cls,
-        col: pl.Series,
-        precision: int | None = None,
-        *,
-        compensate: bool = True,
-    ) -> pl.Series:
-        """Round float column to specified precision.
+        parts: Sequence[pl.DataFrame],
+        round_carry: Mapping[str, float] | None = None,
+    ) -> list[dict[str, float]]:
+        """Compute the Kahan rounding state before and after every part.
 
-        Uses Kahan summation algorithm to compensate for floating-point rounding
-        errors when compensate=True, ensuring that the sum of rounded values
-        matches the rounded sum of original values.
+        The rounding errors of a part do not depend on the state, so the states
+        are cheap to compute up front and the parts can then be rounded in parallel
+        as if they were rounded one after the other in one pass.
 
         Args:
-            col: Polars Series of float type
-            precision: Number of decimal places. If None, uses get_col_precision_map()
+            parts: Standardized parts of the data in rounding order
+            round_carry: Kahan rounding state before the first part
+
+        Returns:
+            list[dict[str, float]]: The state before every part followed by
+                the state after the last part
+        """
+        carries = [dict(round_carry or {})]
+        for part in parts:
+            lf = cls.fill_nulls_lazy(part.lazy())
+            carry_df = cls.get_round_carry_plan(lf, carries[-1]).collect()
+            carries.append(cls.to_round_carry(carry_df))
+        return carries
+
+    @classmethod
+    def get_partition_col(cls) -> str | None:
+        """Get the first column that is part of every unique subset.
+
+        Returns:
+            str | None: Name of the column or None if there are no unique subsets
+
+        Raises:
+            ValueError: If no column is part of every unique subset
+        """
+        unique_subsets = cls.cleaning_config.unique_subsets
+        if not unique_subsets:
+            return None
+        for col in unique_subsets[0]:
+            if all(col in subset for subset in unique_subsets):
+                return col
+        msg = f"No column is part of every unique subset: {unique_subsets}"
+        raise ValueError(msg)
+
+    @classmethod
+    def get_partition_keys(
+        cls,
+        df: pl.DataFrame,
+        n_partitions: int,
+        partition_col: str | None = None,
+    ) -> pl.Series:
+        """Assign each row of a standardized DataFrame to a partition.
+
+        Rows are assigned by the hash of the partition column after null filling
+        and conversion, so rows that are duplicates after cleaning end up
+        in the same partition. Without unique subsets rows are assigned round robin.
+
+        Args:
+            df: Standardized DataFrame to partition
+            n_partitions: Number of partitions
+            partition_col: Column to partition by, defaults to get_partition_col()
+
+        Returns:
+            pl.Series: Partition index of each row
+
+        Raises:
+            ValueError: If partition_col is not part of every unique subset
+        """
+        if partition_col is None:
+            partition_col = cls.get_partition_col()
+        elif not all(partition_col in s for s in cls.cleaning_config.unique_subsets):
+            msg = f"Partition column {partition_col} is not in every unique subset"
+            raise ValueError(msg)
+        if partition_col is None:
+            return pl.int_range(df.height, eager=True) % n_partitions
+        # only the partition column is selected,
+        # so Polars prunes the conversions of all other columns
+        return (
+            cls.convert_cols_lazy(cls.fill_nulls_lazy(df.lazy()))
+            .select(pl.col(partition_col).hash() % n_partitions)
+            .collect()
+            .to_series()
+        )
+
+    @classmethod
+    def clean_many(cls, paths: Iterable[str | Path]) -> Self:
+        """Create a CleaningDF by cleaning many files in parallel.
+
+        Every file is read and cleaned by clean_file() in a bounded thread pool
+        via multithread_loop. Polars releases the GIL while it reads and computes,
+        so the files are processed in parallel without pickling the results.
+        Per file only the row wise stages fill, convert and null-drop run,
+        see clean_part_rows(). The files are then concatenated in the order
+        of paths and duplicates are handled and sorted once over all rows
+        before check(). Deduping every file first would change the result,
+        because the unique subsets are deduped one after the other.
+        For duplicates across files the values that are not added up
+        are taken from the first file in paths. The files are read first,
+        so the Kahan rounding of float columns runs in the order of paths,
+        see get_round_carries().
+
+        Args:
+            paths: Paths of csv, parquet or ipc files with the raw columns
+
+        Returns:
+            Self: The cleaned and checked CleaningDF of all files
+        """
+        paths = list(paths)
+        standardized = multithread_loop(
+            cls.read_file,
+            ((path,) for path in paths),
+            process_args_len=len(paths),
+        )
+        *carries, round_carry = cls.get_round_carries(standardized)
+        cleaned = multithread_loop(
+            cls.clean_part_rows,
+            zip(standardized, carries, strict=True),
+            process_args_len=len(paths),
+        )
+        lf = cls.handle_duplicates_lazy(pl.concat(cleaned).lazy())
+        return cls.from_cleaned_df(cls.sort_cols_lazy(lf).collect(), round_carry)
+
+    @classmethod
+    def iter_clean_many(
+        cls, paths: Iterable[str | Path]
+    ) -> Generator[tuple[Path, Self], None, None]:
+        """Clean many files in parallel and yield each one as soon as it finishes.
+
+        Uses the same bounded thread pool as clean_many() but yields the files
+        in the order they complete. No deduplication across files is done.
+
+        Args:
+            paths: Paths of csv, parquet or ipc files with the raw columns
+
+        Yields:
+            tuple[Path, Self]: Path of the file and its cleaned and checked CleaningDF
+        """
+        files = [Path(path) for path in paths]
+        max_workers = find_max_pools(threads=True, process_args_len=len(files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(cls.clean_file, file): file for file in files}
+            for future in as_completed(futures):
+                yield futures[future], cls.from_cleaned_df(future.result())
+
+    @classmethod
+    def read_file(cls, source: str | Path) -> pl.DataFrame:
+        """Read a single file and standardize it, used as worker of clean_many().
+
+        Args:
+            source: Path of a csv, parquet or ipc file with the raw columns
+
+        Returns:
+            pl.DataFrame: Standardized data of the file
+        """
+        return cls.get_standardize_plan(cls.scan_raw_file(source)).collect()
+
+    @classmethod
+    def clean_file(cls, source: str | Path) -> pl.DataFrame:
+        """Read and clean a single file, used as worker of iter_clean_many().
+
+        Args:
+            source: Path of a csv, parquet or ipc file with the raw columns
+
+        Returns:
+            pl.DataFrame: Cleaned data of the file, not yet checked
+        """
+        lf = cls.get_standardize_plan(cls.scan_raw_file(source))
+        return cls.get_clean_plan(lf).collect()
+
+    @classmethod
+    def from_cleaned_df(
+        cls,
+        df: pl.DataFrame,
+        round_carry: Mapping[str, float] | None = None,
+        *,
+        check: bool = True,
+        compacted: bool = False,
+    ) -> Self:
+        """Create a CleaningDF from an already cleaned DataFrame.
+
+        Skips the cleaning pipeline and only runs check().
+
+        Args:
+            df: DataFrame that was cleaned with this class
+            round_carry: Kahan rounding state after the rows of df, see clean()
+            check: If False, skip check() as well, e.g. for data that was
+                checked when it was written
+            compacted: If True, df was compacted with compact(),
+                so check() accepts its compact dtypes
+
+        Returns:
+            Self: The checked CleaningDF
+
+        Raises:
+            TypeError: If any column has incorrect data type
+            ValueError: If required columns contain nulls or float columns contain NaN
+        """
+        obj = cls.__new__(cls)
+        obj.df = df
+        obj.round_carry = dict(round_carry or {})
+        obj.compacted = compacted
+        if check:
+            obj.check()
+        return obj
+
+    def append(
+        self, *args: Any, options: CleaningOptions | None = None, **kwargs: Any
+    ) -> None:
+        """Clean a new batch of data and merge it into the already cleaned data.
+
+        Only the batch runs the cleaning pipeline. For each unique subset the batch
+        rows whose key already exists are folded into the existing row
+        by adding their get_add_on_duplicate_cols() values, see merge_duplicates().
+        The remaining rows are inserted at their sorted positions,
+        see insert_sorted(), so the existing data is not sorted again.
+        Only if an add on duplicate col is also a sort col the merged
+        data is sorted again, because the summed rows may have moved.
+        The Kahan rounding of the batch resumes from self.round_carry,
+        so appending batches rounds like cleaning all rows in one pass.
+
+        Args:
+            *args: Positional arguments passed to pl.DataFrame constructor
+            options: Options of the batch pipeline run, its round_carry
+                is replaced by self.round_carry
+            **kwargs: Additional keyword arguments passed to pl.DataFrame constructor
+
+        Raises:
+            ValueError: If the data was compacted with compact(). Its integer
+                dtypes only hold the range of the existing rows and its enum
+                columns do not sort like strings, so append all batches first.
+        """
+        if self.compacted:
+            msg = "Cannot append to compacted data, call compact() after all appends"
+            raise ValueError(msg)
+        if options is None:
+            options = CleaningOptions()
+        batch_c_df = self.__class__(
+            *args, options=options.replace(round_carry=self.round_carry), **kwargs
+        )
+        self.round_carry = batch_c_df.round_carry
+        batch = batch_c_df.df
+        df = self.df
+        for subset in self.cleaning_config.unique_subsets:
+            df, batch = self.merge_duplicates(df, batch, subset)
+        if self.sums_sort_cols():
+            self.df = self.sort_cols_lazy(pl.concat([df, batch]).lazy()).collect()
+            return
+        self.df = self.insert_sorted(df, batch)
+
+    @classmethod
+    def merge_duplicates(
+        cls,
+        df: pl.DataFrame,
+        batch: pl.DataFrame,
+        subset: tuple[str, ...],
+    ) -> tuple[pl.DataFrame, pl.DataFrame]:
+        """Fold the rows of a cleaned batch into the cleaned rows with the same key.
+
+        The add on duplicate cols of the batch row are added to the existing row,
+        all other values of the existing row are kept, like in handle_duplicates().
+        Both frames are unique on subset, so every batch row matches
+        at most one existing row.
+
+        Args:
+            df: Cleaned DataFrame
+            batch: Cleaned batch to merge into df
+            subset: Columns that identify duplicates
+
+        Returns:
+            tuple[pl.DataFrame, pl.DataFrame]: The updated df and the batch rows
+                without a duplicate in df
+        """
+        matches = (
+            batch.with_row_index(BATCH_INDEX_COL)
+            .join(
+                df.select(subset).with_row_index(TARGET_INDEX_COL),
+                on=subset,
+                nulls_equal=True,
+            )
+            .sort(TARGET_INDEX_COL)
+        )
+        if matches.is_empty():
+            return df, batch
+        target_index = matches[TARGET_INDEX_COL]
+        df = df.with_columns(
+            df[col].scatter(target_index, df[col].gather(target_index) + matches[col])
+            for col in cls.cleaning_config.add_on_duplicate_cols
+        )
+        batch = batch.filter(
+            ~pl.int_range(pl.len()).is_in(matches[BATCH_INDEX_COL].implode())
+        )
+        return df, batch
+
+    @classmethod
+    def insert_sorted(cls, df: pl.DataFrame, batch: pl.DataFrame) -> pl.DataFrame:
+        """Insert the rows of a sorted batch into a sorted DataFrame.
+
+        The insert positions are found by binary search, see get_insert_positions(),
+        and the rows are placed with a single gather,
+        so no comparison sort over df is needed.
+
+        Args:
+            df: DataFrame sorted by get_sort_cols()
+            batch: DataFrame sorted by get_sort_cols()
+
+        Returns:
+            pl.DataFrame: Both frames combined and sorted by get_sort_cols()
+        """
+        if not cls.cleaning_config.sort_cols or df.is_empty() or batch.is_empty():
+            return pl.concat([df, batch])
+        height = df.height + batch.height
+        batch_slots = cls.get_insert_positions(df, batch) + pl.int_range(
+            batch.height, eager=True
+        )
+        is_batch = pl.repeat(value=False, n=height, eager=True).scatter(
+            batch_slots, values=True
+        )
+        order = is_batch.to_frame("is_batch").select(
+            pl.when(pl.col("is_batch"))
+            .then(pl.col("is_batch").cum_sum() - 1 + df.height)
+            .otherwise((~pl.col("is_batch")).cum_sum() - 1)
+        )
+        return pl.concat([df, batch]).select(pl.all().gather(order.to_series()))
+
+    @classmethod
+    def get_insert_positions(
+        cls,
+        df: pl.DataFrame,
+        batch: pl.DataFrame,
+        side: Literal["left", "right"] = "right",
+    ) -> pl.Series:
+        """Find where the rows of batch have to be inserted to keep df sorted.
+
+        All batch rows are binary searched at once. Each step gathers the df row
+        in the middle of every remaining range and compares it with the batch
+        rows by all of get_sort_cols(), see get_sorts_before_expr(),
+        so the search takes log2(df.height) vectorized steps.
+
+        Args:
+            df: DataFrame sorted by get_sort_cols()
+            batch: Rows to find the positions of
+            side: "right" to insert after the rows of df with the same
+                sort values, "left" to insert before them
+
+        Returns:
+            pl.Series: Index in df before which each batch row belongs
+        """
+        cols = [col for col, _ in cls.cleaning_config.sort_cols]
+        keys, batch_keys = df.select(cols), batch.select(cols)
+        # right: batch row before middle row, left: middle row before batch row
+        if side == "right":
+            keys = keys.select(pl.all().name.suffix(SEARCH_SUFFIX))
+        else:
+            batch_keys = batch_keys.select(pl.all().name.suffix(SEARCH_SUFFIX))
+        is_before_expr = cls.get_sorts_before_expr(SEARCH_SUFFIX)
+        if side == "left":
+            is_before_expr = ~is_before_expr
+        low = pl.zeros(batch.height, dtype=pl.Int64, eager=True)
+        high = pl.repeat(df.height, batch.height, dtype=pl.Int64, eager=True)
+        for _ in range(df.height.bit_length()):
+            mid = (low + high) // 2
+            middle = keys.select(pl.all().gather(mid.clip(upper_bound=df.height - 1)))
+            is_before = (
+                pl.concat([batch_keys, middle], how="horizontal")
+                .select(is_before_expr)
+                .to_series()
+            )
+            is_open = low < high
+            high = mid.zip_with(is_open & is_before, high)
+            low = (mid + 1).zip_with(is_open & ~is_before, low)
+        return low
+
+    @classmethod
+    def get_sorts_before_expr(cls, suffix: str) -> pl.Expr:
+        """Build whether each row sorts before the row in the suffixed columns.
+
+        Compares col by col of get_sort_cols() in their directions
+        with nulls first, like sort_cols().
+
+        Args:
+            suffix: Suffix of the columns to compare with
+
+        Returns:
+            pl.Expr: Boolean expression, False for equal rows
+        """
+        is_before = pl.lit(value=False)
+        for col, descending in reversed(cls.cleaning_config.sort_cols):
+            value, other = pl.col(col), pl.col(f"{col}{suffix}")
+            is_smaller = (
+                pl.when(value.is_null())
+                .then(other.is_not_null())
+                .when(other.is_null())
+                .then(pl.lit(value=False))
+                .otherwise(value > other if descending else value < other)
+            )
+            is_before = is_smaller | (value.eq_missing(other) & is_before)
+        return is_before
+
+    @classmethod
+    def from_csv(
+        cls,
+        source: str | Path,
+        *,
+        scan_kwargs: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """Create a CleaningDF from csv files, reading only the raw columns.
+
+        The raw columns are parsed directly to the dtypes of get_col_dtype_map(),
+        see get_raw_schema_overrides(), and all other columns are never read.
+
+        Args:
+            source: Path or glob of the csv files
+            scan_kwargs: Additional keyword arguments passed to pl.scan_csv
+            **kwargs: Keyword arguments passed to the constructor, e.g. options
+
+        Returns:
+            Self: The cleaned CleaningDF
+        """
+        lf = pl.scan_csv(
+            source,
+            schema_overrides=cls.get_raw_schema_overrides(),
+            **(scan_kwargs or {}),
+        )
+        return cls.from_raw_lazy(lf, **kwargs)
+
+    @classmethod
+    def from_parquet(
+        cls,
+        source: str | Path,
+        *,
+        scan_kwargs: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """Create a CleaningDF from parquet files, reading only the raw columns.
+
+        Parquet files are typed, so the dtypes are cast by cast_cols() as usual.
+
+        Args:
+            source: Path or glob of the parquet files
+            scan_kwargs: Additional keyword arguments passed to pl.scan_parquet
+            **kwargs: Keyword arguments passed to the constructor, e.g. options
+
+        Returns:
+            Self: The cleaned CleaningDF
+        """
+        return cls.from_raw_lazy(
+            pl.scan_parquet(source, **(scan_kwargs or {})), **kwargs
+        )
+
+    @classmethod
+    def from_ipc(
+        cls,
+        source: str | Path,
+        *,
+        scan_kwargs: Mapping[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Self:
+        """Create a CleaningDF from ipc files, reading only the raw columns.
+
+        Ipc files are typed, so the dtypes are cast by cast_cols() as usual.
+
+        Args:
+            source: Path or glob of the ipc files
+            scan_kwargs: Additional keyword arguments passed to pl.scan_ipc
+            **kwargs: Keyword arguments passed to the constructor, e.g. options
+
+        Returns:
+            Self: The cleaned CleaningDF
+        """
+        return cls.from_raw_lazy(pl.scan_ipc(source, **(scan_kwargs or {})), **kwargs)
+
+    @classmethod
+    def read_ipc(
+        cls, source: str | Path, *, check: bool = True, compacted: bool = False
+    ) -> Self:
+        """Open a cleaned frame written by write_ipc() through a memory map.
+
+        Unlike from_ipc(), which cleans raw data, the file already holds cleaned
+        data. The uncompressed Arrow buffers in the file are used directly,
+        so opening takes constant time, only the pages that are accessed
+        are read and all processes on the host share the same page cache pages.
+        The chunks are kept as written, since rechunking would copy them.
+        The Kahan rounding state is restored from the sidecar file
+        written next to it, see get_round_carry_path().
+
+        Args:
+            source: Path of the ipc file
+            check: If False, skip check(), which reads the float and no null
+                columns, when the file is trusted
+            compacted: If True, the file was written after compact()
+
+        Returns:
+            Self: The CleaningDF backed by the memory map
+        """
+        df = pl.read_ipc(source, memory_map=True, rechunk=False)
+        round_carry_path = cls.get_round_carry_path(source)
+        round_carry = (
+            json.loads(round_carry_path.read_text(encoding="utf-8"))
+            if round_carry_path.exists()
+            else None
+        )
+        return cls.from_cleaned_df(df, round_carry, check=check, compacted=compacted)
+
+    def write_ipc(self, sink: str | Path) -> None:
+        """Write the cleaned data to an uncompressed Arrow IPC file for read_ipc().
+
+        The data is written to a temporary file that is then moved into place,
+        see open_atomic(), so readers never open a partially written file and
+        memory maps of the previous version stay valid. Compressed files would
+        have to be decoded into memory, so no compression is used.
+        Arrow IPC files written by Polars have no custom metadata, so
+        self.round_carry is first written to a sidecar file, which lets
+        append() on the result of read_ipc() round like on self.
+
+        Args:
+            sink: Path of the ipc file to write
+        """
+        path = Path(sink)
+        with open_atomic(self.get_round_carry_path(path)) as file:
+            file.write(json.dumps(self.round_carry).encode("utf-8"))
+        with open_atomic(path) as file:
+            self.df.write_ipc(file, compression="uncompressed")
+
+    @classmethod
+    def get_round_carry_path(cls, path: str | Path) -> Path:
+        """Get the path of the sidecar file with the round_carry of an ipc file.
+
+        Args:
+            path: Path of the ipc file written by write_ipc()
+
+        Returns:
+            Path: Path of the JSON file next to it
+        """
+        path = Path(path)
+        return path.with_name(f"{path.name}{ROUND_CARRY_SUFFIX}")
+
+    @classmethod
+    def from_raw_lazy(cls, lf: pl.LazyFrame, **kwargs: Any) -> Self:
+        """Create a CleaningDF from a LazyFrame with the raw column names.
+
+        Only the raw columns of get_rename_map() are selected, so Polars pushes
+        the projection down into the scan and skips all other columns.
+
+        Args:
+            lf: LazyFrame of the raw data
+            **kwargs: Keyword arguments passed to the constructor, e.g. options
+
+        Returns:
+            Self: The cleaned CleaningDF
+        """
+        return cls(lf.select(cls.get_raw_col_names()).collect(), **kwargs)
+
+    @classmethod
+    def from_arrow(cls, data: object, **kwargs: Any) -> Self:
+        """Create a CleaningDF from Arrow data without copying its buffers.
+
+        Accepts any object that implements the Arrow PyCapsule interface, e.g.
+        a pyarrow.Table, pyarrow.RecordBatch or pyarrow.RecordBatchReader,
+        see import_arrow(). pyarrow itself is not required.
+
+        Args:
+            data: Arrow data with the raw column names
+            **kwargs: Keyword arguments passed to the constructor, e.g. options
+
+        Returns:
+            Self: The cleaned CleaningDF
+
+        Raises:
+            TypeError: If data does not implement the Arrow PyCapsule interface
+        """
+        return cls(cls.import_arrow(data), **kwargs)
+
+    @classmethod
+    def import_arrow(cls, data: object) -> pl.DataFrame:
+        """Import Arrow data into a DataFrame through the Arrow C interface.
+
+        pl.DataFrame() converts a pyarrow.Table with pyarrow itself.
+        Importing via __arrow_c_stream__ or __arrow_c_array__ instead wraps the
+        Arrow buffers without copying them and keeps the chunks as they are.
+        Only buffers whose layout differs in Polars, e.g. strings, are converted.
+
+        Args:
+            data: Object implementing __arrow_c_stream__ or __arrow_c_array__
+
+        Returns:
+            pl.DataFrame: DataFrame sharing the buffers of data
+
+        Raises:
+            TypeError: If data does not implement the Arrow PyCapsule interface
+        """
+        if not any(
+            callable(getattr(data, attr, None))
+            for attr in ("__arrow_c_stream__", "__arrow_c_array__")
+        ):
+            msg = f"Expected Arrow data with __arrow_c_stream__, got {type(data)}"
+            raise TypeError(msg)
+        # the C interface imports a table as one struct column
+        return pl.Series(values=data).struct.unnest()
+
+    @classmethod
+    def scan_arrow(cls, batches: Iterable[object]) -> pl.LazyFrame:
+        """Lazily scan a stream of Arrow record batches.
+
+        The batches are imported one at a time with import_arrow() while the
+        query runs, so e.g. a pyarrow.RecordBatchReader from another service
+        is cleaned as a streaming source with iter_batches() or from_raw_lazy().
+        The first batch is read immediately to get the schema.
+        A stream can only be read once, so the LazyFrame can only be collected once.
+
+        Args:
+            batches: Iterable of objects implementing __arrow_c_array__ or
+                __arrow_c_stream__, e.g. a pyarrow.RecordBatchReader
+
+        Returns:
+            pl.LazyFrame: LazyFrame of all columns of the stream
+
+        Raises:
+            ValueError: If the stream is empty or collected a second time
+        """
+        batch_iter = iter(batches)
+        first = next(batch_iter, None)
+        if first is None:
+            msg = "Expected at least one Arrow record batch to get the schema"
+            raise ValueError(msg)
+        first_df = cls.import_arrow(first)
+        dfs = chain((first_df,), map(cls.import_arrow, batch_iter))
+        return cls.scan_batches(dfs, first_df.schema)
+
+    @classmethod
+    def scan_batches(
+        cls, batches: Iterator[pl.DataFrame], schema: pl.Schema
+    ) -> pl.LazyFrame:
+        """Lazily scan DataFrame batches that are produced while the query runs.
+
+        Wraps the iterator in a Polars IO source, which applies the projections,
+        filters and row limits of the query to each batch, so e.g. sink_file()
+        streams the batches to a file.
+        An iterator can only be read once, so the LazyFrame can only be
+        collected once.
+
+        Args:
+            batches: Iterator of DataFrames with the schema
+            schema: Schema of the batches
+
+        Returns:
+            pl.LazyFrame: LazyFrame of the batches
+
+        Raises:
+            ValueError: If the LazyFrame is collected a second time
+        """
+        consumed = False
+
+        def io_source(
+            with_columns: list[str] | None,
+            predicate: pl.Expr | None,
+            n_rows: int | None,
+            _batch_size: int | None,
+        ) -> Iterator[pl.DataFrame]:
+            nonlocal consumed
+            if consumed:
+                msg = "The batches were already read, scan them again"
+                raise ValueError(msg)
+            consumed = True
+            remaining = n_rows
+            for df in batches:
+                batch = df if with_columns is None else df.select(with_columns)
+                if predicate is not None:
+                    batch = batch.filter(predicate)
+                if remaining is not None:
+                    batch = batch.head(remaining)
+                    remaining -= batch.height
+                yield batch
+                if remaining == 0:
+                    return
+
+        return register_io_source(io_source, schema=schema)
+
+    def __arrow_c_stream__(self, requested_schema: object | None = None) -> object:
+        """Export the cleaned data as an Arrow stream without copying it.
+
+        Implements the Arrow PyCapsule interface, so Arrow consumers read
+        the cleaned data directly, e.g. pyarrow.table(cleaning_df)
+        or pyarrow.RecordBatchReader.from_stream(cleaning_df).
+
+        Args:
+            requested_schema: Arrow schema capsule requested by the consumer
+
+        Returns:
+            object: PyCapsule of an ArrowArrayStream over self.df
+        """
+        return self.df.__arrow_c_stream__(requested_schema)
+
+    @classmethod
+    def from_chain(
+        cls,
+        *args: Any,
+        stages: Sequence[type["CleaningDF"]],
+        check_stages: bool = False,
+        **kwargs: Any,
+    ) -> Self:
+        """Create a CleaningDF by running a chain of CleaningDF classes as one query.
+
+        The raw data is cleaned by every class of stages in order and then
+        by this class, where the standardized columns of a stage are the raw
+        columns of the next one, see get_chain_plans(). No intermediate
+        frame is materialized and only the result of this class is checked.
+
+        With check_stages the schemas of the intermediate stages are checked
+        without computing anything and their null and NaN flags are collected
+        together with the result via pl.collect_all, which lets Polars share the
+        common parts of the queries instead of running the chain again per stage.
+
+        Args:
+            *args: Positional arguments passed to pl.DataFrame constructor
+            stages: CleaningDF classes that clean the data before this class
+            check_stages: If True, also validate the output of every stage
+            **kwargs: Additional keyword arguments passed to pl.DataFrame constructor
+
+        Returns:
+            Self: The cleaned and checked CleaningDF
+
+        Raises:
+            TypeError: If any column of a checked stage has an incorrect data type
+            ValueError: If required columns of a checked stage contain nulls
+                or its float columns contain NaN
+        """
+        plans = cls.get_chain_plans(pl.DataFrame(*args, **kwargs).lazy(), stages)
+        if not check_stages:
+            return cls.from_cleaned_df(plans[-1].collect())
+        checked = [
+            (stage, plan)
+            for stage, plan in zip(stages, plans, strict=False)
+            if stage.get_check_flag_exprs()
+        ]
+        for stage, plan in zip(stages, plans, strict=False):
+            stage.check_schema(plan.collect_schema())
+        *flags, df = pl.collect_all(
+            [
+                *(plan.select(stage.get_check_flag_exprs()) for stage, plan in checked),
+                plans[-1],
+            ]
+        )
+        for (stage, _), stage_flags in zip(checked, flags, strict=True):
+            stage.raise_on_check_flags(stage_flags.row(0, named=True))
+        return cls.from_cleaned_df(df)
+
+    @classmethod
+    def get_chain_plans(
+        cls, lf: pl.LazyFrame, stages: Sequence[type["CleaningDF"]]
+    ) -> list[pl.LazyFrame]:
+        """Chain the standardize and clean plans of several CleaningDF classes.
+
+        Every class of stages and finally this class standardizes and cleans
+        the output of the previous one, so the last plan is a single lazy
+        query of the whole chain that can be collected or sunk to a file.
+
+        Args:
+            lf: LazyFrame with the raw column names of the first stage
+            stages: CleaningDF classes that clean the data before this class
+
+        Returns:
+            list[pl.LazyFrame]: The plan after every stage, ending with this class
+        """
+        plans = []
+        for stage in (*stages, cls):
+            lf = stage.get_clean_plan(stage.get_standardize_plan(lf))
+            plans.append(lf)
+        return plans
+
+    @classmethod
+    def get_raw_col_names(cls) -> tuple[str, ...]:
+        """Get the raw column names of get_rename_map() in the column order.
+
+        Returns:
+            tuple[str, ...]: Raw column names
+        """
+        rename_map = cls.cleaning_config.rename_map
+        return tuple(rename_map[col] for col in cls.cleaning_config.col_names)
+
+    @classmethod
+    def get_raw_schema_overrides(cls) -> dict[str, type[pl.DataType]]:
+        """Map the raw column names to the dtypes of get_col_dtype_map().
+
+        Returns:
+            dict[str, type[pl.DataType]]: Dtype of each raw column
+        """
+        rename_map = cls.cleaning_config.rename_map
+        return {
+            rename_map[col]: dtype
+            for col, dtype in cls.cleaning_config.col_dtype_map.items()
+        }
+
+    @classmethod
+    def scan_file(cls, source: str | Path, **scan_kwargs: Any) -> pl.LazyFrame:
+        """Lazily scan a csv, parquet or ipc file based on its suffix.
+
+        Args:
+            source: Path or glob of the files to scan
+            **scan_kwargs: Additional keyword arguments passed to the scan function
+
+        Returns:
+            pl.LazyFrame: LazyFrame of the scanned files
+
+        Raises:
+            ValueError: If the suffix is not supported
+        """
+        scan_funcs: dict[str, Callable[..., pl.LazyFrame]] = {
+            ".csv": pl.scan_csv,
+            ".parquet": pl.scan_parquet,
+            ".ipc": pl.scan_ipc,
+            ".arrow": pl.scan_ipc,
+            ".feather": pl.scan_ipc,
+        }
+        suffix = Path(source).suffix
+        if suffix not in scan_funcs:
+            msg = f"Unsupported file suffix {suffix}, expected one of {[*scan_funcs]}"
+            raise ValueError(msg)
+        return scan_funcs[suffix](source, **scan_kwargs)
+
+    @classmethod
+    def scan_raw_file(cls, source: str | Path) -> pl.LazyFrame:
+        """Lazily scan only the raw columns of a csv, parquet or ipc file.
+
+        Like the file constructors, csv columns are parsed directly
+        to their target dtypes, see get_raw_schema_overrides().
+
+        Args:
+            source: Path or glob of the files to scan
+
+        Returns:
+            pl.LazyFrame: LazyFrame of the raw columns
+        """
+        scan_kwargs = (
+            {"schema_overrides": cls.get_raw_schema_overrides()}
+            if Path(source).suffix == ".csv"
+            else {}
+        )
+        return cls.scan_file(source, **scan_kwargs).select(cls.get_raw_col_names())
+
+    @classmethod
+    def sink_file(cls, lf: pl.LazyFrame, sink: str | Path) -> None:
+        """Write a LazyFrame to a parquet or ipc file with the streaming engine.
+
+        Args:
+            lf: LazyFrame to write
+            sink: Path of the file to write, the suffix determines the format
+
+        Raises:
+            ValueError: If the suffix is not supported
+        """
+        suffix = Path(sink).suffix
+        if suffix == ".parquet":
+            lf.sink_parquet(sink, engine="streaming")
+        elif suffix in (".ipc", ".arrow", ".feather"):
+            lf.sink_ipc(sink, engine="streaming")
+        else:
+            msg = f"Unsupported file suffix {suffix} for sink {sink}"
+            raise ValueError(msg)
+
+    @classmethod
+    def get_standardize_plan(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Bring raw input into the standardized schema as one lazy query.
+
+        Applies rename_cols_lazy(), drop_cols_lazy() and cast_cols_lazy(),
+        which are the steps __init__ applies before cleaning.
+
+        Args:
+            lf: LazyFrame with raw column names
+
+        Returns:
+            pl.LazyFrame: LazyFrame with standardized column names and dtypes
+        """
+        lf = cls.rename_cols_lazy(lf)
+        lf = cls.drop_cols_lazy(lf)
+        return cls.cast_cols_lazy(lf)
+
+    @classmethod
+    def get_clean_plan(
+        cls,
+        lf: pl.LazyFrame,
+        *,
+        presorted: bool = False,
+        round_carry: Mapping[str, float] | None = None,
+        optimize: bool = False,
+        sort: bool = True,
+    ) -> pl.LazyFrame:
+        """Chain all frame transforming cleaning stages into one lazy query.
+
+        Applies fill_nulls_lazy(), convert_cols_lazy(), drop_null_subsets_lazy(),
+        handle_duplicates_lazy() and sort_cols_lazy() in the same order as clean().
+        Nothing is computed until the returned LazyFrame is collected.
+
+        Args:
+            lf: LazyFrame with standardized column names and dtypes
+            presorted: If True, the converted data is sorted by get_sort_cols()
+            round_carry: Kahan rounding state to resume from, see round_expr()
+            optimize: If True, order the stages with get_stage_order()
+            sort: If False, leave out sort_cols_lazy(), e.g. for external_sort()
+
+        Returns:
+            pl.LazyFrame: The lazy query of the cleaned dataframe
+        """
+        stage_plans: dict[str, Callable[[pl.LazyFrame], pl.LazyFrame]] = {
+            "fill_nulls": cls.fill_nulls_lazy,
+            "convert_cols": lambda lf: cls.convert_cols_lazy(
+                lf, round_carry=round_carry
+            ),
+            "drop_null_subsets": cls.drop_null_subsets_lazy,
+            "handle_duplicates": lambda lf: cls.handle_duplicates_lazy(
+                lf, presorted=presorted
+            ),
+        }
+        for stage in cls.get_stage_order(optimize=optimize):
+            lf = stage_plans[stage](lf)
+        return cls.sort_cols_lazy(lf, presorted=presorted) if sort else lf
+
+    @classmethod
+    def get_stage_order(cls, *, optimize: bool = False) -> tuple[str, ...]:
+        """Get the order of the stages before sort_cols() in clean().
+
+        By default the order is CLEAN_STAGES. In optimizing mode each stage
+        of ROW_REDUCING_STAGES moves before the stages of MOVABLE_STAGES
+        in front of it as long as can_move_before() holds. The relative order
+        of the row reducing stages is kept, so handle_duplicates() never moves
+        before drop_null_subsets().
+
+        Args:
+            optimize: If True, move the row reducing stages as early as is safe
+
+        Returns:
+            tuple[str, ...]: Names of the stage methods in the order to run them
+        """
+        order = list(CLEAN_STAGES)
+        if not optimize:
+            return tuple(order)
+        for stage in ROW_REDUCING_STAGES:
+            i = order.index(stage)
+            while (
+                i > 0
+                and order[i - 1] in MOVABLE_STAGES
+                and cls.can_move_before(stage, order[i - 1])
+            ):
+                order[i - 1], order[i] = order[i], order[i - 1]
+                i -= 1
+        return tuple(order)
+
+    @classmethod
+    def can_move_before(cls, stage: str, other: str) -> bool:
+        """Check if a row reducing stage gives the same result before another stage.
+
+        Dropping rows before other does not change the kept rows if other is
+        row wise and does not write any column that stage reads, see
+        is_row_wise_stage(), get_stage_write_cols() and get_stage_read_cols().
+        drop_null_subsets() only reads whether its columns are null,
+        so conversions that keep nulls as nulls do not block it.
+
+        Args:
+            stage: Name of a stage of ROW_REDUCING_STAGES
+            other: Name of a stage of MOVABLE_STAGES
+
+        Returns:
+            bool: True if stage can run before other
+        """
+        if not cls.is_row_wise_stage(other):
+            return False
+        writes = cls.get_stage_write_cols(
+            other, nulls_only=stage == "drop_null_subsets"
+        )
+        return writes.isdisjoint(cls.get_stage_read_cols(stage))
+
+    @classmethod
+    def is_row_wise_stage(cls, stage: str) -> bool:
+        """Check if the values a movable stage produces for a row only depend on it.
+
+        fill_nulls() is row wise. convert_cols() is not if there are Float64
+        columns, whose Kahan rounding carries the error from row to row, or any
+        custom converter that is neither skip_col_converter() nor marked with
+        row_wise_converter.
+
+        Args:
+            stage: Name of a stage of MOVABLE_STAGES
+
+        Returns:
+            bool: True if the stage is row wise
+        """
+        if stage == "fill_nulls":
+            return True
+        config = cls.cleaning_config
+        if pl.Float64 in config.col_dtype_map.values():
+            return False
+        return all(
+            cls.is_skip_col_converter(converter) or is_row_wise_converter(converter)
+            for converter in config.col_converter_map.values()
+        )
+
+    @classmethod
+    def get_stage_write_cols(cls, stage: str, *, nulls_only: bool = False) -> set[str]:
+        """Get the columns whose values a movable stage may change.
+
+        fill_nulls() writes the columns with a fill value. convert_cols() writes
+        the Utf8 and Float64 columns with its standard conversions, which keep
+        nulls as nulls, and the columns of the custom converters, which may not.
+
+        Args:
+            stage: Name of a stage of MOVABLE_STAGES
+            nulls_only: If True, only get the columns whose nulls may change
+
+        Returns:
+            set[str]: Names of the written columns
+        """
+        config = cls.cleaning_config
+        if stage == "fill_nulls":
+            return {
+                col
+                for col, fill_value in config.fill_null_map.items()
+                if fill_value is not None
+            }
+        writes = {
+            col
+            for col, converter in config.col_converter_map.items()
+            if not cls.is_skip_col_converter(converter)
+        }
+        if not nulls_only:
+            writes.update(
+                col
+                for col, dtype in config.col_dtype_map.items()
+                if dtype in (pl.Utf8, pl.Float64)
+            )
+        return writes
+
+    @classmethod
+    def get_stage_read_cols(cls, stage: str) -> set[str]:
+        """Get the columns that decide which rows a row reducing stage keeps.
+
+        drop_null_subsets() reads the columns of get_drop_null_expr().
+        handle_duplicates() reads the unique subsets, the add on duplicate
+        columns it sums and the sort columns that decide if the data is sorted.
+
+        Args:
+            stage: Name of a stage of ROW_REDUCING_STAGES
+
+        Returns:
+            set[str]: Names of the read columns
+        """
+        config = cls.cleaning_config
+        if stage == "drop_null_subsets":
+            subsets = config.drop_null_subsets or (config.col_names,)
+            return {col for subset in subsets for col in subset}
+        return {
+            *(col for subset in config.unique_subsets for col in subset),
+            *config.add_on_duplicate_cols,
+            *(col for col, _ in config.sort_cols),
+        }
+
+    @classmethod
+    def raise_on_missing_cols(
+        cls,
+        map_func: Callable[..., Mapping[str, Any]],
+    ) -> None:
+        """Validate that all required columns are present in a configuration map.
+
+        Checks that the columns returned by map_func contain all columns in col_names.
+        Raises KeyError if any required columns are missing from the map.
+
+        Args:
+            map_func: A callable that returns a dict with column names as keys
+
+        Raises:
+            KeyError: If any required columns are missing from the map
+        """
+        col_names = cls.get_col_names()
+        missing_cols = set(col_names) - set(map_func().keys())
+        if missing_cols:
+            msg = f"Missing columns in {map_func.__name__}: {missing_cols}"
+            raise KeyError(msg)
+
+    def rename_cols(self, temp_df: pl.DataFrame) -> pl.DataFrame:
+        """Rename columns from raw names to standardized names.
+
+        Applies the reverse of get_rename_map() to rename columns from their raw
+        input names to standardized names.
+        """
+        return self.rename_cols_lazy(temp_df.lazy()).collect()
+
+    @classmethod
+    def rename_cols_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Lazy version of rename_cols().
+
+        Args:
+            lf: LazyFrame with raw column names
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the renaming added to the query
+        """
+        return lf.rename(reverse_dict(dict(cls.cleaning_config.rename_map)))
+
+    def drop_cols(self, temp_df: pl.DataFrame) -> pl.DataFrame:
+        """Drop columns not in the schema.
+
+        Selects only the columns defined in get_col_names(), removing any extra
+        columns that may have been in the input data.
+        """
+        return self.drop_cols_lazy(temp_df.lazy()).collect()
+
+    @classmethod
+    def drop_cols_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Lazy version of drop_cols().
+
+        Args:
+            lf: LazyFrame with standardized column names
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the column selection added to the query
+        """
+        return lf.select(cls.cleaning_config.col_names)
+
+    def cast_cols(self, temp_df: pl.DataFrame) -> pl.DataFrame:
+        """Cast columns to the dtypes of get_col_dtype_map().
+
+        Casts every column to its expected dtype and converts NaN to null in
+        float columns. Columns that already have the expected dtype are not copied.
+        """
+        return self.cast_cols_lazy(temp_df.lazy()).collect()
+
+    @classmethod
+    def cast_cols_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Lazy version of cast_cols().
+
+        Args:
+            lf: LazyFrame with standardized column names
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the casts added to the query
+        """
+        exprs: list[pl.Expr] = []
+        for col_name, dtype in cls.cleaning_config.col_dtype_map.items():
+            expr = pl.col(col_name).cast(dtype)
+            if issubclass(dtype, FloatType):
+                expr = expr.fill_nan(None)
+            exprs.append(expr)
+        return lf.with_columns(exprs)
+
+    def fill_nulls(self) -> None:
+        """Fill null values with defaults from the fill null map.
+
+        Replaces null values in each column with the corresponding fill value
+        from get_fill_null_map().
+        """
+        self.df = self.fill_nulls_lazy(self.df.lazy()).collect()
+
+    @classmethod
+    def fill_nulls_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Lazy version of fill_nulls().
+
+        Args:
+            lf: LazyFrame to fill the nulls of
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the null fills added to the query
+        """
+        return lf.with_columns(
+            [
+                pl.col(col_name).fill_null(fill_value)
+                for col_name, fill_value in cls.cleaning_config.fill_null_map.items()
+                if fill_value is not None
+            ]
+        )
+
+    def convert_cols(self, round_carry: Mapping[str, float] | None = None) -> None:
+        """Apply standard and custom column conversions.
+
+        Orchestrates both standard conversions (string stripping, float rounding)
+        and custom conversions defined in get_col_converter_map().
+        They run as the single with_columns call of convert_cols_lazy(),
+        collected together with the Kahan rounding state of the float columns.
+        Only when profiling they run as separate stages,
+        see standard_convert_cols() and custom_convert_cols().
+
+        Args:
+            round_carry: Kahan rounding state to resume from, see round_expr()
+        """
+        if self.profile is not None:
+            with self.profile_stage("standard_convert_cols"):
+                self.standard_convert_cols(round_carry)
+            self.custom_convert_cols()
+            return
+        lf = self.df.lazy()
+        self.df, carry_df = pl.collect_all(
+            [
+                self.convert_cols_lazy(lf, round_carry),
+                self.get_round_carry_plan(lf, round_carry),
+            ]
+        )
+        self.round_carry = self.to_round_carry(carry_df)
+
+    @classmethod
+    def convert_cols_lazy(
+        cls,
+        lf: pl.LazyFrame,
+        round_carry: Mapping[str, float] | None = None,
+    ) -> pl.LazyFrame:
+        """Lazy version of convert_cols().
+
+        Fuses the standard and the custom function converters of all columns
+        into a single with_columns call.
+
+        Args:
+            lf: LazyFrame to convert the columns of
+            round_carry: Kahan rounding state to resume from, see round_expr()
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the conversions added to the query
+        """
+        round_carry = round_carry or {}
+        lf = lf.with_columns(
+            cls.get_convert_expr(col_name, carry=round_carry.get(col_name, 0.0))
+            for col_name in cls.cleaning_config.col_names
+        )
+        return cls.apply_converter_exprs_lazy(lf)
+
+    @classmethod
+    def get_convert_expr(
+        cls,
+        col_name: str,
+        *,
+        standard: bool = True,
+        custom: bool = True,
+        carry: float = 0.0,
+    ) -> pl.Expr:
+        """Build the conversion expression of a column.
+
+        Chains the standard conversion (strip for Utf8, Kahan rounding for Float64)
+        and the custom function converter from get_col_converter_map().
+        Converters given as pl.Expr are not included,
+        see apply_converter_exprs_lazy().
+
+        Args:
+            col_name: Name of the column to convert
+            standard: If True, include the standard conversion
+            custom: If True, include the custom function converter
+            carry: Kahan rounding state of a float column, see round_expr()
+
+        Returns:
+            pl.Expr: Expression of the converted column
+        """
+        dtype = cls.cleaning_config.col_dtype_map[col_name]
+        expr = pl.col(col_name)
+        if standard:
+            if dtype == pl.Utf8:
+                expr = cls.strip_expr(expr)
+            elif dtype == pl.Float64:
+                expr = cls.round_expr(
+                    expr, cls.cleaning_config.col_precision_map[col_name], carry=carry
+                )
+        if not custom:
+            return expr
+        converter = cls.cleaning_config.col_converter_map[col_name]
+        if isinstance(converter, pl.Expr) or cls.is_skip_col_converter(converter):
+            return expr
+        if is_expr_converter(converter):
+            return converter(expr).alias(col_name)
+        series_converter = cast("Callable[[pl.Series], pl.Series]", converter)
+        return expr.map_batches(series_converter, return_dtype=dtype)
+
+    @classmethod
+    def apply_converter_exprs_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Apply the converters of get_col_converter_map() that are a pl.Expr.
+
+        They are evaluated together in one with_columns call after all
+        function converters, so they see the converted columns.
+
+        Args:
+            lf: LazyFrame to convert the columns of
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the expression converters added to the query
+        """
+        exprs = [
+            converter.alias(col_name)
+            for col_name, converter in cls.cleaning_config.col_converter_map.items()
+            if isinstance(converter, pl.Expr)
+        ]
+        if not exprs:
+            return lf
+        return lf.with_columns(exprs)
+
+    def standard_convert_cols(
+        self, round_carry: Mapping[str, float] | None = None
+    ) -> None:
+        """Apply standard conversions based on data type.
+
+        Automatically applies standard transformations:
+        - Utf8 columns: strip leading/trailing whitespace
+        - Float64 columns: round to specified precision using Kahan summation
+
+        The Kahan rounding state after all rows is computed in the same
+        collect and stored in self.round_carry.
+
+        Args:
+            round_carry: Kahan rounding state to resume from, see round_expr()
+        """
+        lf = self.df.lazy()
+        self.df, carry_df = pl.collect_all(
+            [
+                self.standard_convert_cols_lazy(lf, round_carry),
+                self.get_round_carry_plan(lf, round_carry),
+            ]
+        )
+        self.round_carry = self.to_round_carry(carry_df)
+
+    @classmethod
+    def standard_convert_cols_lazy(
+        cls,
+        lf: pl.LazyFrame,
+        round_carry: Mapping[str, float] | None = None,
+    ) -> pl.LazyFrame:
+        """Lazy version of standard_convert_cols().
+
+        Args:
+            lf: LazyFrame to convert the columns of
+            round_carry: Kahan rounding state to resume from, see round_expr()
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the standard conversions added to the query
+        """
+        round_carry = round_carry or {}
+        return lf.with_columns(
+            cls.get_convert_expr(
+                col_name, custom=False, carry=round_carry.get(col_name, 0.0)
+            )
+            for col_name, dtype in cls.cleaning_config.col_dtype_map.items()
+            if dtype in (pl.Utf8, pl.Float64)
+        )
+
+    @classmethod
+    def round_float_cols_lazy(
+        cls,
+        lf: pl.LazyFrame,
+        round_carry: Mapping[str, float] | None = None,
+    ) -> pl.LazyFrame:
+        """Apply only the Kahan rounding of the standard conversion to float columns.
+
+        Rounding the rounded values again in convert_cols_lazy() changes nothing,
+        since all their rounding errors are zero. So the rows can be rounded
+        in their order first and then be converted in any order,
+        e.g. in the partitions of clean_partitioned().
+
+        Args:
+            lf: LazyFrame with null filled, not yet converted float columns
+            round_carry: Kahan rounding state to resume from, see round_expr()
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the Float64 columns rounded
+        """
+        round_carry = round_carry or {}
+        return lf.with_columns(
+            cls.get_convert_expr(
+                col_name, custom=False, carry=round_carry.get(col_name, 0.0)
+            )
+            for col_name, dtype in cls.cleaning_config.col_dtype_map.items()
+            if dtype == pl.Float64
+        )
+
+    @classmethod
+    def to_round_carry(cls, carry_df: pl.DataFrame) -> dict[str, float]:
+        """Read the Kahan rounding state from the result of get_round_carry_plan().
+
+        Args:
+            carry_df: Collected result of get_round_carry_plan()
+
+        Returns:
+            dict[str, float]: Kahan rounding state of every Float64 column
+        """
+        if not carry_df.width:
+            return {}
+        return carry_df.row(0, named=True)
+
+    @classmethod
+    def get_round_carry_plan(
+        cls,
+        lf: pl.LazyFrame,
+        round_carry: Mapping[str, float] | None = None,
+    ) -> pl.LazyFrame:
+        """Build the query of the Kahan rounding state after all rows of a frame.
+
+        Args:
+            lf: LazyFrame with null filled, not yet converted float columns
+            round_carry: Kahan rounding state before the first row
+
+        Returns:
+            pl.LazyFrame: One row with the state of every Float64 column,
+                see get_round_carry_expr()
+        """
+        round_carry = round_carry or {}
+        return lf.select(
+            cls.get_round_carry_expr(
+                pl.col(col_name),
+                cls.cleaning_config.col_precision_map[col_name],
+                carry=round_carry.get(col_name, 0.0),
+            )
+            for col_name, dtype in cls.cleaning_config.col_dtype_map.items()
+            if dtype == pl.Float64
+        )
+
+    def custom_convert_cols(self) -> None:
+        """Apply custom conversion functions to columns.
+
+        Applies custom transformations from get_col_converter_map() to each column,
+        skipping columns marked with skip_col_converter.
+        When profiling, each column is converted and recorded as its own stage.
+        """
+        if self.profile is None:
+            self.df = self.custom_convert_cols_lazy(self.df.lazy()).collect()
+            return
+        for col_name in self.cleaning_config.col_converter_map:
+            with self.profile_stage(f"custom_convert_cols[{col_name}]"):
+                self.df = self.df.with_columns(
+                    self.get_convert_expr(col_name, standard=False)
+                )
+        with self.profile_stage("apply_converter_exprs"):
+            self.df = self.apply_converter_exprs_lazy(self.df.lazy()).collect()
+
+    @classmethod
+    def custom_convert_cols_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Lazy version of custom_convert_cols().
+
+        Args:
+            lf: LazyFrame to convert the columns of
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the custom conversions added to the query
+        """
+        lf = lf.with_columns(
+            cls.get_convert_expr(col_name, standard=False)
+            for col_name in cls.cleaning_config.col_converter_map
+        )
+        return cls.apply_converter_exprs_lazy(lf)
+
+    @classmethod
+    @row_wise_converter
+    def strip_col(cls, col: pl.Series) -> pl.Series:
+        """Remove leading and trailing whitespace from string column.
+
+        Args:
+            col: Polars Series of string type
+
+        Returns:
+            pl.Series: Series with whitespace stripped
+        """
+        return col.str.strip_chars()
+
+    @classmethod
+    @row_wise_converter
+    @expr_converter
+    def strip_expr(cls, col: pl.Expr) -> pl.Expr:
+        """Expression version of strip_col().
+
+        Args:
+            col: Expression of a string column
+
+        Returns:
+            pl.Expr: Expression with whitespace stripped
+        """
+        return col.str.strip_chars()
+
+    @classmethod
+    @row_wise_converter
+    def lower_col(cls, col: pl.Series) -> pl.Series:
+        """Convert string column to lowercase.
+
+        Args:
+            col: Polars Series of string type
+
+        Returns:
+            pl.Series: Series with all characters converted to lowercase
+        """
+        return col.str.to_lowercase()
+
+    @classmethod
+    @row_wise_converter
+    @expr_converter
+    def lower_expr(cls, col: pl.Expr) -> pl.Expr:
+        """Expression version of lower_col().
+
+        Args:
+            col: Expression of a string column
+
+        Returns:
+            pl.Expr: Expression with all characters converted to lowercase
+        """
+        return col.str.to_lowercase()
+
+    @classmethod
+    def round_col(
+        cls,
+        col: pl.Series,
+        precision: int | None = None,
+        *,
+        compensate: bool = True,
+        carry: float = 0.0,
+    ) -> pl.Series:
+        """Round float column to specified precision.
+
+        Uses Kahan summation algorithm to compensate for floating-point rounding
+        errors when compensate=True, ensuring that the sum of rounded values
+        matches the rounded sum of original values. Ties can break differently
+        than in a sequential Kahan loop, see round_expr().
+
+        Args:
+            col: Polars Series of float type
+            precision: Number of decimal places. If None, uses get_col_precision_map()
             compensate: If True, use Kahan summation to reduce rounding errors
+            carry: Kahan rounding state to resume from, see round_expr()
 
         Returns:
             pl.Series: Series with values rounded to specified precision
         """
         if precision is None:
-            precision = cls.get_col_precision_map()[str(col.name)]
+            precision = cls.cleaning_config.col_precision_map[str(col.name)]
+        return (
+            col.to_frame()
+            .select(
+                cls.round_expr(
+                    pl.first(), precision, compensate=compensate, carry=carry
+                )
+            )
+            .to_series()
+        )
+
+    @classmethod
+    def round_expr(
+        cls,
+        expr: pl.Expr,
+        precision: int,
+        *,
+        compensate: bool = True,
+        carry: float = 0.0,
+    ) -> pl.Expr:
+        """Vectorized expression version of round_col().
+
+        The Kahan loop carries the rounding error of each value into the next one.
+        The error carried into a value is the running sum of all previous rounding
+        errors, so every value is rounded on its own and the change of the rounded
+        running error is added on top. All of this runs natively in Polars without
+        creating a Python float per row. Nulls are kept as nulls and skipped.
+
+        The running sum starts at carry, the sum of the rounding errors of all
+        preceding rows, see get_round_carry_expr(). Rounding a column in parts
+        with the carry of the previous part gives the same result
+        as rounding it in one pass.
+
+        The result matches the sequential Kahan loop except on ties. The loop
+        rounds each value plus the error carried so far, so how a tie breaks
+        depends on every earlier decision, which cannot be computed without
+        a Python loop. Here ties break on the rounded running error instead,
+        e.g. [0.5] * 4 at precision 0 gives [0.0, 1.0, 1.0, 0.0] where the loop
+        gives [0.0, 1.0, 0.0, 1.0]. Both only swap a unit between neighbouring
+        values: every value is rounded to precision and the running sum of
+        the result stays within half a unit of the running sum of the input.
+
+        Args:
+            expr: Expression of a float column
+            precision: Number of decimal places
+            compensate: If True, carry the rounding errors like Kahan summation
+            carry: Sum of the rounding errors of the preceding rows
+
+        Returns:
+            pl.Expr: Expression of the rounded column
+        """
+        rounded = expr.round(precision)
         if not compensate:
-            return col.round(precision)
+            return rounded
+        running = cls.get_round_errors_expr(expr, precision, carry).cum_sum()
+        running = running.round(precision)
+        previous = running.shift(1, fill_value=round(carry, precision))
+        return (rounded + running - previous).round(precision)
+
+    @classmethod
+    def get_round_carry_expr(
+        cls,
+        expr: pl.Expr,
+        precision: int,
+        *,
+        carry: float = 0.0,
+    ) -> pl.Expr:
+        """Build the Kahan rounding state after the last value of a float column.
+
+        The state is the running sum of the rounding errors in the same summation
+        order as round_expr(), so passing it as carry to the next part
+        resumes the rounding exactly.
+
+        Args:
+            expr: Expression of a float column
+            precision: Number of decimal places
+            carry: Kahan rounding state before the first value
 
-        # compensate for rounding errors with kahan sum
-        error = 0.0
-        values = []
-        for value in col.to_list():  # Ensure iteration over Python floats
-            corrected = value + error
-            rounded = round(corrected, precision)
-            error = corrected - rounded
-            values.append(rounded)
+        Returns:
+            pl.Expr: Scalar expression of the state, carry if there are no values
+        """
+        errors = cls.get_round_errors_expr(expr, precision, carry)
+        return errors.cum_sum().last().fill_null(carry)
+
+    @classmethod
+    def get_round_errors_expr(
+        cls, expr: pl.Expr, precision: int, carry: float = 0.0
+    ) -> pl.Expr:
+        """Build the rounding error of every value with carry added to the first.
 
-        return pl.Series(name=col.name, values=values, dtype=col.dtype)
+        Args:
+            expr: Expression of a float column
+            precision: Number of decimal places
+            carry: Kahan rounding state before the first value
+
+        Returns:
+            pl.Expr: Expression of the rounding errors, 0.0 for nulls
+        """
+        errors = (expr - expr.round(precision)).fill_null(0.0)
+        if not carry:
+            return errors
+        return errors + pl.when(pl.int_range(pl.len()) == 0).then(carry).otherwise(0.0)
 
     @classmethod
     def skip_col_converter(cls, _col: pl.Series) -> pl.Series:
@@ -513,20 +2697,62 @@ class CleaningDF(ABCLoggingMixin):
         )
         raise NotImplementedError(msg)
 
+    @classmethod
+    def is_skip_col_converter(cls, converter: ColConverter) -> bool:
+        """Check if a converter is the skip_col_converter flag.
+
+        Args:
+            converter: Converter from get_col_converter_map()
+
+        Returns:
+            bool: True if the column should not be converted
+        """
+        return (
+            not isinstance(converter, pl.Expr)
+            and converter.__name__ == cls.skip_col_converter.__name__
+        )
+
     def drop_null_subsets(self) -> None:
         """Drop rows where all columns in a subset are null.
 
         Applies null-dropping rules defined in get_drop_null_subsets(). If no
         subsets are defined, drops rows where all columns are null.
+        All subsets are applied with a single filter, see get_drop_null_expr().
         """
-        subsets = self.get_drop_null_subsets()
+        self.df = self.df.filter(self.get_drop_null_expr())
+
+    @classmethod
+    def drop_null_subsets_lazy(cls, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """Lazy version of drop_null_subsets().
+
+        Args:
+            lf: LazyFrame to drop the null rows of
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the null dropping added to the query
+        """
+        return lf.filter(cls.get_drop_null_expr())
+
+    @classmethod
+    def get_drop_null_expr(cls) -> pl.Expr:
+        """Get one predicate that keeps the rows drop_null_subsets() keeps.
+
+        Dropping the nulls of each subset one after the other filters and
+        copies the frame once per subset. A row is dropped by any subset that
+        has a null in the row, so the subsets combine into one check over the
+        union of their columns and the frame is filtered once.
+        Without subsets the check covers all columns.
+
+        Returns:
+            pl.Expr: Boolean expression that is True for the rows to keep
+        """
+        subsets = cls.cleaning_config.drop_null_subsets
         if not subsets:
-            self.df = self.df.drop_nulls()
-            return
-        for subset in subsets:
-            self.df = self.df.drop_nulls(subset=subset)
+            return pl.all_horizontal(pl.all().is_not_null())
+        cols = dict.fromkeys(col for subset in subsets for col in subset)
+        return pl.all_horizontal(pl.col(*cols).is_not_null())
 
-    def handle_duplicates(self) -> None:
+    def handle_duplicates(self, *, presorted: bool = False) -> None:
         """Remove duplicate rows and aggregate specified columns.
 
         For each uniqueness subset defined in get_unique_subsets():
@@ -535,22 +2761,447 @@ class CleaningDF(ABCLoggingMixin):
 
         Example: If two rows have the same (user_id, date) and values 1 and 2
         in the 'quantity' column, the result will have one row with quantity=3.
+
+        The rows keep the order of the first row of their duplicate group.
+
+        Args:
+            presorted: If True, the data is sorted by get_sort_cols(),
+                see dedupe_subset_lazy()
+        """
+        lf = self.handle_duplicates_lazy(self.df.lazy(), presorted=presorted)
+        self.df = lf.collect()
+
+    @classmethod
+    def handle_duplicates_lazy(
+        cls, lf: pl.LazyFrame, *, presorted: bool = False
+    ) -> pl.LazyFrame:
+        """Lazy version of handle_duplicates().
+
+        Args:
+            lf: LazyFrame to remove the duplicates of
+            presorted: If True, the data is sorted by get_sort_cols()
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the duplicate handling added to the query
         """
-        for subset in self.get_unique_subsets():
-            for col in self.get_add_on_duplicate_cols():
-                self.df = self.df.with_columns(pl.col(col).sum().over(subset))
-            self.df = self.df.unique(subset=subset, keep="first")
+        for subset in cls.cleaning_config.unique_subsets:
+            lf = cls.dedupe_subset_lazy(lf, subset, presorted=presorted)
+            # summed sort cols may break the order for the next subset
+            presorted = presorted and not cls.sums_sort_cols()
+        return lf
+
+    @classmethod
+    def dedupe_subset_lazy(
+        cls, lf: pl.LazyFrame, subset: tuple[str, ...], *, presorted: bool = False
+    ) -> pl.LazyFrame:
+        """Remove duplicates of one uniqueness subset in a single aggregation.
+
+        Hashes the subset columns once in a group_by and computes the sums of all
+        get_add_on_duplicate_cols() and the first value of every other column in
+        the same aggregation. Groups keep the order of their first row.
+        Add on columns that are part of the subset are summed as well,
+        like the other add on columns.
+
+        If the data is presorted and the subset makes up the leading sort cols,
+        duplicates are adjacent. Then the groups are the runs of equal
+        subset values, numbered with rle_id() in one linear pass, and Polars
+        aggregates the sorted run ids with contiguous slices instead of hashing.
+
+        Args:
+            lf: LazyFrame to remove the duplicates of
+            subset: Columns that identify duplicate rows
+            presorted: If True, the data is sorted by get_sort_cols()
+
+        Returns:
+            pl.LazyFrame: LazyFrame with one row per distinct subset value
+        """
+        col_names = lf.collect_schema().names()
+        sum_cols = cls.cleaning_config.add_on_duplicate_cols
+        if presorted and cls.is_adjacent_subset(subset):
+            return (
+                lf.with_columns(
+                    pl.struct(subset).rle_id().set_sorted().alias(RUN_ID_COL)
+                )
+                .group_by(RUN_ID_COL, maintain_order=True)
+                .agg(
+                    *(pl.col(col).sum() for col in sum_cols),
+                    pl.all().exclude(RUN_ID_COL, *sum_cols).first(),
+                )
+                .select(col_names)
+            )
+        # group keys can not be aggregated under their own name
+        key_sum_cols = {col: f"__sum_{col}" for col in sum_cols if col in subset}
+        return (
+            lf.group_by(subset, maintain_order=True)
+            .agg(
+                *(
+                    pl.col(col).sum().alias(key_sum_cols.get(col, col))
+                    for col in sum_cols
+                ),
+                pl.all().exclude(*subset, *sum_cols).first(),
+            )
+            .with_columns(
+                pl.col(alias).alias(col) for col, alias in key_sum_cols.items()
+            )
+            .select(col_names)
+        )
 
-    def sort_cols(self) -> None:
+    def sort_cols(self, *, presorted: bool = False) -> None:
         """Sort the dataframe by columns and directions from get_sort_cols().
 
         Applies multi-column sorting with per-column sort direction
         (ascending/descending).
+
+        Args:
+            presorted: If True, the data was sorted before handle_duplicates(),
+                see sort_cols_lazy()
+        """
+        self.df = self.sort_cols_lazy(self.df.lazy(), presorted=presorted).collect()
+
+    @classmethod
+    def sort_cols_lazy(
+        cls, lf: pl.LazyFrame, *, presorted: bool = False
+    ) -> pl.LazyFrame:
+        """Lazy version of sort_cols().
+
+        The sort is skipped for presorted data, because duplicate handling keeps
+        the row order. Only if an add on duplicate col is a sort col
+        the summed rows may have moved and the data is sorted anyway.
+
+        Args:
+            lf: LazyFrame to sort
+            presorted: If True, the data was sorted before handle_duplicates()
+
+        Returns:
+            pl.LazyFrame: LazyFrame with the sort added to the query
+        """
+        sort_cols = cls.cleaning_config.sort_cols
+        if not sort_cols or (presorted and not cls.sums_sort_cols()):
+            return lf
+        cols, desc = zip(*sort_cols, strict=True)
+        return lf.sort(cols, descending=desc)
+
+    @classmethod
+    def external_sort(
+        cls,
+        lf: pl.LazyFrame,
+        sink: str | Path | None = None,
+        *,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        tmp_dir: str | Path | None = None,
+    ) -> pl.DataFrame | None:
+        """Sort data that does not fit into memory by spilling sorted chunks to disk.
+
+        Sorts like sort_cols(), but the input is never held in memory as a whole,
+        see iter_external_sort(). The sorted batches are either written to sink
+        with sink_file() or concatenated into a DataFrame.
+
+        Args:
+            lf: LazyFrame to sort, e.g. from get_clean_plan() with sort=False
+            sink: Path of a parquet or ipc file to stream the result to
+            chunk_size: Number of rows per sorted chunk
+            tmp_dir: Directory for the spilled chunks, the system default if None
+
+        Returns:
+            pl.DataFrame | None: The sorted data or None if it was written to sink
+        """
+        batches = cls.iter_external_sort(lf, chunk_size=chunk_size, tmp_dir=tmp_dir)
+        if sink is None:
+            return pl.concat([lf.clear().collect(), *batches], rechunk=False)
+        cls.sink_file(cls.scan_batches(batches, lf.collect_schema()), sink)
+        return None
+
+    @classmethod
+    def iter_external_sort(
+        cls,
+        lf: pl.LazyFrame,
+        *,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        tmp_dir: str | Path | None = None,
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Sort by get_sort_cols() with bounded memory and yield sorted batches.
+
+        The input is collected in streaming batches of chunk_size rows,
+        each batch is sorted and spilled to a temporary ipc file with
+        spill_sorted_runs() and the files are merged by merge_sorted_runs()
+        in batches of about chunk_size rows.
+        The temporary files are deleted when the generator is closed.
+
+        Args:
+            lf: LazyFrame to sort
+            chunk_size: Number of rows per sorted chunk
+            tmp_dir: Directory for the spilled chunks, the system default if None
+
+        Yields:
+            pl.DataFrame: Batches that are sorted in themselves and among each other
+        """
+        if not cls.cleaning_config.sort_cols:
+            yield from lf.collect_batches(chunk_size=chunk_size, lazy=True)
+            return
+        with tempfile.TemporaryDirectory(dir=tmp_dir) as spill_dir:
+            paths = cls.spill_sorted_runs(lf, Path(spill_dir), chunk_size=chunk_size)
+            yield from cls.merge_sorted_runs(paths, batch_size=chunk_size)
+
+    @classmethod
+    def spill_sorted_runs(
+        cls, lf: pl.LazyFrame, spill_dir: Path, *, chunk_size: int
+    ) -> list[Path]:
+        """Sort the input in chunks and write each chunk to an uncompressed ipc file.
+
+        Args:
+            lf: LazyFrame to sort
+            spill_dir: Directory to write the files to
+            chunk_size: Number of rows per chunk
+
+        Returns:
+            list[Path]: Paths of the sorted runs in the order of the input
+        """
+        paths = []
+        for i, batch in enumerate(lf.collect_batches(chunk_size=chunk_size, lazy=True)):
+            path = spill_dir / f"run_{i}.arrow"
+            run = cls.sort_cols_lazy(batch.lazy()).collect()
+            run.write_ipc(path, compression="uncompressed")
+            paths.append(path)
+        return paths
+
+    @classmethod
+    def merge_sorted_runs(
+        cls, paths: Sequence[Path], *, batch_size: int
+    ) -> Generator[pl.DataFrame, None, None]:
+        """K-way merge sorted ipc files in batches.
+
+        Each run is memory mapped. Every step-th row of each run is a sample,
+        where step is the total number of rows // batch_size, so about
+        batch_size samples are held no matter how many runs there are.
+        Every sample stands for step rows, so every batch_size // step-th
+        of the sorted samples bounds a batch. All runs are cut at all bounds
+        with one get_insert_positions() per run, so a batch is the slices
+        of the runs between two bounds, sorted. A batch has about batch_size
+        rows, but it can have up to step more rows per run, since a run is only
+        sampled every step rows. Rows with equal sort values are never split.
+        The slices are sorted in the order of the runs with equal keys kept
+        in place, so the merge is stable.
+
+        Args:
+            paths: Paths of ipc files that are each sorted by get_sort_cols()
+            batch_size: Number of rows per yielded batch
+
+        Yields:
+            pl.DataFrame: Sorted batches in the order of the result
         """
-        cols, desc = zip(*self.get_sort_cols(), strict=True)
-        if not cols:
+        cols, desc = zip(*cls.cleaning_config.sort_cols, strict=True)
+        runs = [pl.read_ipc(path, memory_map=True, rechunk=False) for path in paths]
+        if not runs:
             return
-        self.df = self.df.sort(cols, descending=desc)
+        step = max(1, sum(run.height for run in runs) // batch_size)
+        offsets = accumulate((run.height for run in runs), initial=-(step // 2))
+        samples = pl.concat(
+            run.select(cols).gather_every(step, offset=-offset % step)
+            for run, offset in zip(runs, offsets, strict=False)
+        )
+        per_batch = max(1, batch_size // step)
+        bounds = samples.sort(cols, descending=desc).gather_every(
+            per_batch, offset=per_batch
+        )
+        cuts = [
+            pl.concat(
+                [
+                    pl.Series([0], dtype=pl.Int64),
+                    cls.get_insert_positions(run, bounds, side="left").cast(pl.Int64),
+                    pl.Series([run.height], dtype=pl.Int64),
+                ]
+            )
+            for run in runs
+        ]
+        for i in range(bounds.height + 1):
+            slices = [
+                run.slice(run_cuts[i], run_cuts[i + 1] - run_cuts[i])
+                for run, run_cuts in zip(runs, cuts, strict=True)
+            ]
+            batch = pl.concat(slices, rechunk=False)
+            if batch.height:
+                yield batch.sort(cols, descending=desc, maintain_order=True)
+
+    @classmethod
+    def sums_sort_cols(cls) -> bool:
+        """Check if duplicate handling adds up a column of get_sort_cols().
+
+        Returns:
+            bool: True if an add on duplicate col is also a sort col
+        """
+        sort_col_names = {col for col, _ in cls.cleaning_config.sort_cols}
+        return bool(
+            sort_col_names.intersection(cls.cleaning_config.add_on_duplicate_cols)
+        )
+
+    @classmethod
+    def is_sorted_df(cls, df: pl.DataFrame) -> bool:
+        """Detect if a DataFrame is sorted by get_sort_cols() in one linear pass.
+
+        Every row is compared with its predecessor lexicographically
+        over the sort cols with vectorized shifts, see get_sorted_expr().
+        Without sort cols there is nothing to gain and False is returned.
+
+        Args:
+            df: DataFrame with standardized column names
+
+        Returns:
+            bool: True if df is sorted like sort_cols() sorts it
+        """
+        if not cls.cleaning_config.sort_cols:
+            return False
+        return bool(df.select(cls.get_sorted_expr()).item())
+
+    @classmethod
+    def get_sorted_expr(cls) -> pl.Expr:
+        """Build an expression that is True if the rows are sorted by get_sort_cols().
+
+        Nulls are ordered first, like in sort_cols(). A row is in order if it
+        is strictly after its predecessor in a sort col and equal in all
+        previous sort cols, or equal to its predecessor in all sort cols.
+
+        Returns:
+            pl.Expr: Boolean scalar expression
+        """
+        in_order = pl.lit(value=True)
+        for col, descending in reversed(cls.cleaning_config.sort_cols):
+            prev, curr = pl.col(col).shift(1), pl.col(col)
+            after = (
+                pl.when(prev.is_null())
+                .then(curr.is_not_null())
+                .when(curr.is_null())
+                .then(pl.lit(value=False))
+                .otherwise(prev > curr if descending else prev < curr)
+            )
+            in_order = after | (prev.eq_missing(curr) & in_order)
+        return (in_order | (pl.int_range(pl.len()) == 0)).all()
+
+    @classmethod
+    def is_adjacent_subset(cls, subset: tuple[str, ...]) -> bool:
+        """Check if sorting by get_sort_cols() makes duplicates of a subset adjacent.
+
+        This is the case if the subset consists of the leading sort cols
+        in any order.
+
+        Args:
+            subset: Columns that identify duplicate rows
+
+        Returns:
+            bool: True if the subset equals the leading sort cols
+        """
+        leading = cls.cleaning_config.sort_cols[: len(subset)]
+        return len(leading) == len(subset) and {col for col, _ in leading} == set(
+            subset
+        )
+
+    def compact(self) -> None:
+        """Reduce the memory of the cleaned data with compact dtypes.
+
+        Encodes the string columns of get_compact_str_map() as pl.Enum or
+        pl.Categorical and downcasts integer columns to the smallest integer type
+        of the same signedness that holds their observed range.
+        The ranges of all integer columns are computed in a single select.
+        Sets self.compacted, so check_correct_dtypes() accepts the compact dtypes.
+        Call it after all appends, append() raises on compacted data.
+        """
+        int_cols = [
+            col
+            for col, dtype in self.cleaning_config.col_dtype_map.items()
+            if dtype.is_integer()
+        ]
+        bounds = self.df.select(
+            *(pl.col(col).min().alias(f"min_{col}") for col in int_cols),
+            *(pl.col(col).max().alias(f"max_{col}") for col in int_cols),
+        ).row(0, named=True)
+        self.df = self.df.with_columns(
+            *(
+                pl.col(col).cast(
+                    self.get_compact_int_dtype(
+                        self.cleaning_config.col_dtype_map[col],
+                        bounds[f"min_{col}"],
+                        bounds[f"max_{col}"],
+                    )
+                )
+                for col in int_cols
+            ),
+            *(
+                pl.col(col).cast(
+                    pl.Categorical if categories is None else pl.Enum(categories)
+                )
+                for col, categories in self.cleaning_config.compact_str_map.items()
+            ),
+        )
+        self.compacted = True
+
+    @classmethod
+    def get_compact_int_dtype(
+        cls,
+        dtype: type[pl.DataType],
+        min_value: int | None,
+        max_value: int | None,
+    ) -> type[pl.DataType]:
+        """Get the smallest integer dtype that holds a range of values.
+
+        Args:
+            dtype: Integer dtype of the column, its signedness is kept
+            min_value: Smallest value of the column or None if all values are null
+            max_value: Largest value of the column or None if all values are null
+
+        Returns:
+            type[pl.DataType]: The smallest fitting integer dtype
+        """
+        signed = dtype.is_signed_integer()
+        candidates: tuple[tuple[type[pl.DataType], int], ...] = (
+            ((pl.Int8, 8), (pl.Int16, 16), (pl.Int32, 32), (pl.Int64, 64))
+            if signed
+            else ((pl.UInt8, 8), (pl.UInt16, 16), (pl.UInt32, 32), (pl.UInt64, 64))
+        )
+        if min_value is None or max_value is None:
+            return candidates[0][0]
+        for candidate, bits in candidates:
+            low, high = (
+                (-(2 ** (bits - 1)), 2 ** (bits - 1) - 1)
+                if signed
+                else (0, 2**bits - 1)
+            )
+            if low <= min_value and max_value <= high:
+                return candidate
+        return dtype
+
+    @classmethod
+    def is_compatible_dtype(
+        cls,
+        col: str,
+        dtype: pl.DataType | None,
+        *,
+        compacted: bool = False,
+    ) -> bool:
+        """Check if a dtype is the expected dtype of a column or its compact form.
+
+        Only compacted data may have compact dtypes: Integer columns accept
+        any integer dtype of the same signedness and the string columns of
+        get_compact_str_map() accept pl.Enum and pl.Categorical, see compact().
+
+        Args:
+            col: Name of the column
+            dtype: Actual dtype of the column or None if it is missing
+            compacted: If True, accept the compact dtypes of compact()
+
+        Returns:
+            bool: True if the dtype is accepted for the column
+        """
+        expected = cls.cleaning_config.col_dtype_map[col]
+        if dtype is None:
+            return False
+        if dtype == expected:
+            return True
+        if not compacted:
+            return False
+        if expected.is_integer() and dtype.is_integer():
+            return expected.is_signed_integer() == dtype.is_signed_integer()
+        return col in cls.cleaning_config.compact_str_map and isinstance(
+            dtype, (pl.Categorical, pl.Enum)
+        )
 
     def check(self) -> None:
         """Validate data quality after cleaning.
@@ -560,61 +3211,175 @@ class CleaningDF(ABCLoggingMixin):
         - No null values in required columns
         - No NaN values in float columns
 
+        The dtypes are checked on the schema only. The null and NaN flags of all
+        columns are computed in a single select, see check_values_lazy().
+        All violations of a kind are reported together.
+
         Called automatically at the end of the clean() pipeline.
 
         Raises:
             TypeError: If any column has incorrect data type
             ValueError: If required columns contain nulls or float columns contain NaN
         """
-        self.check_correct_dtypes()
-        self.check_no_null_cols()
-        self.check_no_nan()
+        with self.profile_stage("check_correct_dtypes"):
+            self.check_correct_dtypes()
+        with self.profile_stage("check_values"):
+            self.check_values_lazy(self.df.lazy())
+
+    @classmethod
+    def check_lazy(cls, lf: pl.LazyFrame, *, compacted: bool = False) -> None:
+        """Lazy version of check() that validates a LazyFrame.
+
+        The dtypes are checked on the schema only and the null and NaN flags
+        are computed in a single streaming query,
+        so the data is never fully loaded into memory.
+
+        Args:
+            lf: LazyFrame of cleaned data to validate
+            compacted: If True, accept the compact dtypes of compact()
+
+        Raises:
+            TypeError: If any column has incorrect data type
+            ValueError: If required columns contain nulls or float columns contain NaN
+        """
+        cls.check_schema(lf.collect_schema(), compacted=compacted)
+        cls.check_values_lazy(lf, streaming=True)
+
+    @classmethod
+    def check_values_lazy(
+        cls,
+        lf: pl.LazyFrame,
+        *,
+        streaming: bool = False,
+        nulls: bool = True,
+        nans: bool = True,
+    ) -> None:
+        """Validate the null and NaN flags of all columns in a single query.
+
+        Args:
+            lf: LazyFrame of cleaned data to validate
+            streaming: If True, collect the flags with the streaming engine
+            nulls: If False, skip the null flags of the required columns
+            nans: If False, skip the NaN flags of the float columns
+
+        Raises:
+            ValueError: If required columns contain nulls or float columns contain NaN
+        """
+        flag_exprs = cls.get_check_flag_exprs(nulls=nulls, nans=nans)
+        if not flag_exprs:
+            return
+        flags = (
+            lf.select(flag_exprs)
+            .collect(engine="streaming" if streaming else "auto")
+            .row(0, named=True)
+        )
+        cls.raise_on_check_flags(flags)
+
+    @classmethod
+    def get_check_flag_exprs(
+        cls, *, nulls: bool = True, nans: bool = True
+    ) -> list[pl.Expr]:
+        """Build the expressions of the null and NaN flags checked by check().
+
+        Args:
+            nulls: If True, include the null flags of the required columns
+            nans: If True, include the NaN flags of the float columns
+
+        Returns:
+            list[pl.Expr]: One boolean aggregation per required column
+                and per float column
+        """
+        no_null_cols = cls.cleaning_config.no_null_cols if nulls else ()
+        float_cols = cls.cleaning_config.float_cols if nans else ()
+        return [
+            *(
+                pl.col(col).is_null().any().alias(f"{NULL_FLAG_PREFIX}{col}")
+                for col in no_null_cols
+            ),
+            *(
+                pl.col(col).is_nan().any().alias(f"{NAN_FLAG_PREFIX}{col}")
+                for col in float_cols
+            ),
+        ]
+
+    @classmethod
+    def raise_on_check_flags(cls, flags: Mapping[str, bool]) -> None:
+        """Raise one error that reports all null and NaN violations.
+
+        Args:
+            flags: Row of the flags built by get_check_flag_exprs(),
+                missing flags count as not set
+
+        Raises:
+            ValueError: If any of the flags is set
+        """
+        violations = [
+            f"Null values found in column: {col}"
+            for col in cls.cleaning_config.no_null_cols
+            if flags.get(f"{NULL_FLAG_PREFIX}{col}")
+        ]
+        nan_cols = [
+            col
+            for col in cls.cleaning_config.float_cols
+            if flags.get(f"{NAN_FLAG_PREFIX}{col}")
+        ]
+        if nan_cols:
+            violations.append(f"NaN values found in the dataframe: {nan_cols}")
+        if violations:
+            msg = "; ".join(violations)
+            raise ValueError(msg)
 
     def check_correct_dtypes(self) -> None:
         """Validate that all columns have their expected data types.
 
+        The compact dtypes are only accepted after compact().
+
+        Raises:
+            TypeError: If any column's actual type doesn't match expected type
+        """
+        self.check_schema(self.df.schema, compacted=self.compacted)
+
+    @classmethod
+    def check_schema(cls, schema: pl.Schema, *, compacted: bool = False) -> None:
+        """Validate that a schema has the expected data types.
+
+        Reports all columns with a wrong or missing dtype together.
+
+        Args:
+            schema: Schema of the cleaned data
+            compacted: If True, accept the compact dtypes of compact(),
+                see is_compatible_dtype()
+
         Raises:
             TypeError: If any column's actual type doesn't match expected type
         """
-        schema = self.df.schema
-        col_dtype_map = self.get_col_dtype_map()
-        for col, dtype in col_dtype_map.items():
-            schema_dtype = schema[col]
-            if schema_dtype != dtype:
-                msg = f"Expected dtype {dtype} for column {col}, got {schema_dtype}"
-                raise TypeError(msg)
+        violations = [
+            f"Expected dtype {dtype} for column {col}, got {schema.get(col)}"
+            for col, dtype in cls.cleaning_config.col_dtype_map.items()
+            if not cls.is_compatible_dtype(col, schema.get(col), compacted=compacted)
+        ]
+        if violations:
+            msg = "; ".join(violations)
+            raise TypeError(msg)
 
     def check_no_null_cols(self) -> None:
         """Validate that required columns contain no null values.
 
+        Checks only the null flags of check_values_lazy(),
+        check() validates them together with the NaN flags in one query.
+
         Raises:
             ValueError: If any column in get_no_null_cols() contains null values
         """
-        no_null_cols = self.get_no_null_cols()
-        # Use a single select to check all columns at once
-        null_flags = self.df.select(
-            [pl.col(col).is_null().any() for col in no_null_cols]
-        )
-        # Iterate over columns and check if any have nulls
-        for col in no_null_cols:
-            if null_flags[col].item():
-                msg = f"Null values found in column: {col}"
-                raise ValueError(msg)
+        self.check_values_lazy(self.df.lazy(), nans=False)
 
     def check_no_nan(self) -> None:
         """Validate that float columns contain no NaN values.
 
+        Checks only the NaN flags of check_values_lazy(),
+        check() validates them together with the null flags in one query.
+
         Raises:
             ValueError: If any float column contains NaN values
         """
-        float_cols = [
-            col
-            for col, dtype in self.get_col_dtype_map().items()
-            if issubclass(dtype, FloatType)
-        ]
-        has_nan = self.df.select(
-            pl.any_horizontal(pl.col(float_cols).is_nan().any())
-        ).item()
-        if has_nan:
-            msg = "NaN values found in the dataframe"
-            raise ValueError(msg)
+        self.check_values_lazy(self.df.lazy(), nulls=False)